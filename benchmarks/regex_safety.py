@@ -0,0 +1,93 @@
+"""
+Project:        EU ROL Tracker Dashboard
+Module Name:    Regular Expression Safety Benchmark
+Author:         Carlos Alberto Toruño Paniagua
+Creation Date:  October 17th, 2026
+Description:    This module benchmarks the regular expression mode of the Search Engine (tools/safe_regex.py)
+                against the Python lookaheads that the page used to build, with benign and adversarial
+                patterns. Run it from the root of the repository:
+
+                    python -m benchmarks.regex_safety --country Estonia --scale 10 --timeout 5
+
+                The lookaheads could backtrack for hours, so they are also run within the time budget and
+                reported as cancelled once it runs out. The --adversarial option appends rows built to make
+                backtracking engines explode.
+"""
+
+import argparse
+import time
+
+import pandas as pd
+import pyarrow as pa
+
+from tools import loader
+from tools import safe_regex
+
+# Patterns typed in the keywords box. The adversarial ones backtrack exponentially in Python's engine
+PATTERNS = [
+    ("benign",      "court"),
+    ("benign",      "police court"),
+    ("benign",      "\\bEuropean\\s+funds\\b"),
+    ("benign",      "(?<=prime\\s)minister"),
+    ("adversarial", "(a+)+$"),
+    ("adversarial", "(a|aa)+$"),
+    ("adversarial", "(\\w+\\s?)+$"),
+    ("adversarial", "(x+x+)+y"),
+    ("adversarial", "(\\w+\\s?)+(?<!\\.)$"),
+    ("adversarial", "((a+)+)\\2$"),
+]
+
+
+def lookahead_pattern(keywords):
+    # The pattern the Search Engine used to build from the keywords
+    keys = "".join(f"(?=.*{key})" for key in safe_regex.keyword_patterns(keywords))
+    return "^" + keys
+
+
+def timed(func):
+    start = time.perf_counter()
+    try:
+        matched = func()
+        return time.perf_counter() - start, int(matched.sum())
+    except TimeoutError:
+        return time.perf_counter() - start, None
+
+
+def engine(keywords):
+    try:
+        safe_regex.linear_match(pd.Series([""]), safe_regex.keyword_patterns(keywords))
+        return "RE2"
+    except pa.ArrowInvalid:
+        return "Python"
+
+
+def describe(seconds, matches):
+    if matches is None:
+        return f"{'cancelled':>10} ({seconds:6.2f} s)"
+    return f"{matches:>10,} ({seconds:6.2f} s)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Benchmarks the regular expression mode of the Search Engine.")
+    parser.add_argument("--country",     default = "Estonia")
+    parser.add_argument("--scale",       default = 1, type = int, help = "Number of times the data is repeated.")
+    parser.add_argument("--adversarial", default = 10, type = int, help = "Number of adversarial rows added.")
+    parser.add_argument("--timeout",     default = safe_regex.REGEX_TIMEOUT, type = float, help = "Time budget (s).")
+    args = parser.parse_args()
+
+    summaries = loader.load_pillars(args.country, ["summary"])["summary"].astype(object)
+    texts = pd.concat(
+        [summaries] * args.scale + [pd.Series(["a" * 30 + "!"] * args.adversarial)],
+        ignore_index = True
+    )
+    print(f"{args.country} x{args.scale}: {len(texts):,} rows, time budget of {args.timeout:g} s")
+    print(f"  {'pattern':<26} {'engine':<7} {'python lookaheads':>24} {'safe mode':>24}")
+
+    for kind, keywords in PATTERNS:
+        old = timed(lambda: safe_regex.bounded_match(texts, [lookahead_pattern(keywords)], args.timeout))
+        new = timed(lambda: safe_regex.search(texts, keywords, args.timeout))
+        print(f"  {keywords:<26} {engine(keywords):<7} {describe(*old):>24} {describe(*new):>24}  {kind}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Project:        EU ROL Tracker Dashboard
+Module Name:    Time Buckets Benchmark
+Author:         Carlos Alberto Toruño Paniagua
+Creation Date:  October 17th, 2026
+Description:    This module benchmarks the vectorized week bucketing in tools/time_buckets.py against the
+                per-row Period.start_time lambda that the pages used to run. Run it from the root of the
+                repository:
+
+                    python -m benchmarks.time_buckets --country Estonia --scale 100
+
+                The --scale option repeats the country data to emulate the largest countries.
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from tools import loader
+from tools import time_buckets
+
+
+def period_lambda(dates):
+    week_start = dates.dt.to_period("W").apply(lambda x: x.start_time)
+    return week_start.dt.date
+
+
+def vectorized(dates):
+    return time_buckets.bucket(dates, "week")
+
+
+def best_of(func, dates, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(dates)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Benchmarks the week bucketing of a full-country frame.")
+    parser.add_argument("--country", default = "Estonia")
+    parser.add_argument("--scale",   default = 1, type = int, help = "Number of times the data is repeated.")
+    parser.add_argument("--repeat",  default = 3, type = int, help = "Number of timed runs per method.")
+    args = parser.parse_args()
+
+    master = pd.read_parquet(loader.master_path(args.country), columns = ["published_date"])
+    dates  = pd.to_datetime(master["published_date"])
+    dates  = pd.Series(np.tile(dates.to_numpy(), args.scale))
+
+    # Both methods must agree before comparing their speed
+    expected = pd.to_datetime(period_lambda(dates))
+    assert (vectorized(dates) == expected).all()
+
+    old = best_of(period_lambda, dates, args.repeat)
+    new = best_of(vectorized, dates, args.repeat)
+    print(f"{args.country} x{args.scale}: {len(dates):,} rows")
+    print(f"  to_period + lambda : {old*1000:10.1f} ms")
+    print(f"  time_buckets.bucket: {new*1000:10.1f} ms")
+    print(f"  speedup            : {old/new:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
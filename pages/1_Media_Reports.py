@@ -8,8 +8,9 @@ Description:    This module contains the code of the Media Reportss tab for the
 
 import json
 import re
-import pandas as pd
+from datetime import datetime
 import streamlit as st
+from tools import catalog
 
 # Initializing session states fpr country data
 if "country_track" not in st.session_state:
@@ -92,17 +93,16 @@ if st.session_state["country_track"]:
 
     st.markdown(f"<h2>{country}</h2>", unsafe_allow_html = True)
 
-    # Loading data for country
-    country_data = pd.read_parquet(f"data/news-data/{country}_master.parquet.gzip")
+    # Loading the country manifest. Article data is never loaded here
+    manifest = catalog.manifest(country)
     with open(f"data/summaries/{country.lower()}.json", "r") as file:
         summary_data = json.load(file)
 
     # Displaying general information
-    sources =  "".join([f"\n\n- <a href='https://{link}' target='_blank'>{link}</a>" for link in country_data["domain_url"].drop_duplicates().to_list()])
-    country_data["published_date"] = pd.to_datetime(country_data['published_date'])
-    min_date  = min(country_data["published_date"]).strftime("%B %d, %Y")
-    max_date  = max(country_data["published_date"]).strftime("%B %d, %Y")
-    nrows     = len(country_data.drop_duplicates(subset='id'))
+    sources =  "".join([f"\n\n- <a href='https://{link}' target='_blank'>{link}</a>" for link in manifest["sources"]])
+    min_date  = datetime.fromisoformat(manifest["date_range"]["min"]).strftime("%B %d, %Y")
+    max_date  = datetime.fromisoformat(manifest["date_range"]["max"]).strftime("%B %d, %Y")
+    nrows     = manifest["n_articles"]
     nrows_fmt = "{:,}".format(nrows)
     st.markdown(
         f"""
@@ -10,6 +10,9 @@ import numpy as np
 import pandas as pd
 import streamlit as st
 from tools import chord
+from tools import aggregates
+from tools import catalog
+from tools import date_index
 from tools import data_viz as viz
 
 # Initializing session states fpr country data
@@ -93,55 +96,43 @@ if st.session_state["country_track"]:
 
     st.markdown(f"<h2>{country}</h2>", unsafe_allow_html = True)
 
-    # Loading data
-    country_data = pd.read_parquet(f"data/news-data/{country}_master.parquet.gzip")
-    country_data["published_date"] = pd.to_datetime(country_data['published_date'])
-    country_data["impact_score_text"] = (
-        country_data["impact_score"].map(
-            { 
-                0 : "Undefined",
-                1 : "Very Negative",
-                2 : "Negative",
-                3 : "Neutral",
-                4 : "Positive",
-                5 : "Very Positive",
-            }
+    # Publishing period of the results
+    date_range = catalog.manifest(country)["date_range"]
+    first_day  = pd.Timestamp(date_range["min"]).date()
+    last_day   = pd.Timestamp(date_range["max"]).date()
+    start_day, end_day = date_index.period(
+        st.date_input(
+            "Limit the results to a publishing period",
+            value     = (first_day, last_day),
+            min_value = first_day,
+            max_value = last_day,
+            key       = f"period_{country}"
         )
     )
-    country_data["week_start"] = (
-        country_data["published_date"]
-        .dt.to_period("W")
-        .apply(lambda x: x.start_time)
-    )
-    country_data["week_start"] = country_data["week_start"].dt.date
-
-
-    summary_per_pillar = (
-        country_data.copy()
-        .loc[country_data["impact_score"] > 0]
-        .groupby(["associated_pillar", "impact_score", "impact_score_text"])
-        .agg(n_articles=("id", "count"))
-        .reset_index()
-    )
-    summary_per_pillar["pillar_order"] = summary_per_pillar["associated_pillar"].replace({
-        "Pillar 1": 1, 
-        "Pillar 2": 2,
-        "Pillar 3": 3,
-        "Pillar 4": 4,
-        "Pillar 5": 5,
-        "Pillar 6": 6,
-        "Pillar 7": 7,
-        "Pillar 8": 8
-    })
-    summary_per_pillar["share"] = (summary_per_pillar["n_articles"] / summary_per_pillar.groupby("associated_pillar")["n_articles"].transform("sum"))*100
-    summary_per_pillar_sorted = summary_per_pillar.sort_values(["pillar_order", "impact_score"], ascending=[True, False])
 
-    nrows     = len(country_data.drop_duplicates(subset='id'))
+    # Loading the aggregates precomputed by tools/ingest.py. Article-level data is never loaded here
+    if (start_day, end_day) != (first_day, last_day):
+        classification = aggregates.load_classification(country, start_day, end_day)
+    else:
+        classification = aggregates.load_classification(country)
+    if classification["per_week_total"].empty:
+        st.warning("No articles were published during this period. Please select a different one.")
+        st.stop()
+    summary_per_pillar_sorted = classification["per_pillar"]
+    summary_per_week_sorted   = classification["per_week"]
+    summary_pw                = classification["per_week_total"]
+    co_occurence_matrix       = classification["cooccurrence"]
+
+    # Number of articles published during the selected period
+    if (start_day, end_day) != (first_day, last_day):
+        nrows = aggregates.count_articles(country, start_day, end_day)
+    else:
+        nrows = catalog.manifest(country)["n_articles"]
     nrows_fmt = "{:,}".format(nrows)
 
     st.markdown(
         f"""
-        A total of {nrows_fmt} articles were read and classified by the Large Language Model along with a in-depth description of
+        A total of {nrows_fmt} articles published during the selected period were read and classified by the Large Language Model along with a in-depth description of
         the <a href="https://ctoruno.github.io/eu-rol-tracker/#conceptual-framework1" target="_blank">conceptual framework 
         used in this pilot project</a>. During a <a href="https://ctoruno.github.io/eu-rol-tracker/#first-stage-broad-classification"
         target="_blank">first stage</a>, the model was tasked to do a wide classification to distinguish news articles related
@@ -183,23 +174,6 @@ if st.session_state["country_track"]:
             hide_index=True
         )
     
-    summary_per_week = (
-        country_data.copy()
-        .loc[country_data["impact_score"] > 0]
-        .drop_duplicates(subset = "id")
-        .groupby(["week_start", "impact_score", "impact_score_text"])
-        .agg(n_articles=("id", "count"))
-        .reset_index()
-    )
-    summary_per_week_sorted = summary_per_week.sort_values(["week_start", "impact_score"])
-    summary_pw = (
-        summary_per_week_sorted.copy()
-        .groupby(["week_start"])
-        .agg(
-            n_articles = ("n_articles", "sum")
-        )
-        .reset_index()
-    )
     max_week = summary_pw.loc[summary_pw["n_articles"] == np.max(summary_pw["n_articles"]), "week_start"].iloc[0].strftime("%B %d, %Y")
     max_arts_week = np.max(summary_pw["n_articles"])
     avg_arts_week = np.mean(summary_pw["n_articles"])
@@ -237,12 +211,6 @@ if st.session_state["country_track"]:
 
     chord_chart, heat, tabs2 = st.tabs(["Chord", "Heatmap", "Table"])
 
-    subset4cooc = (
-        country_data.copy()
-        .drop_duplicates(subset="id")
-        .loc[:,["pillar_1", "pillar_2", "pillar_3", "pillar_4", "pillar_5", "pillar_6", "pillar_7", "pillar_8"]]
-    )
-    co_occurence_matrix = subset4cooc.T.dot(subset4cooc)
     total_sum = co_occurence_matrix.sum()
     co_occurrence_percentage = (co_occurence_matrix / total_sum) * 100
 
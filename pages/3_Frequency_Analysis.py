@@ -9,9 +9,11 @@ Description:    This module contains the code of the Frequency Analysis tab for
 import numpy as np
 import pandas as pd
 import streamlit as st
-from tools import data_viz as viz
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.feature_extraction.text import CountVectorizer
+from tools import catalog
+from tools import date_index
+from tools import frequencies
+from tools import loader
+from tools import wordclouds
 
 # Initializing session states fpr country data
 if "country_track" not in st.session_state:
@@ -20,6 +22,70 @@ if "country_track" not in st.session_state:
 def update_tracking(button_name):
     st.session_state[button_name] = True
 
+# The overview tables and the pillar results are fragments: submitting a pillar form only reruns its own
+# panel, with the inputs of the last full run of the page
+@st.fragment
+def overview(matrix, country_data, stopwords_full, tfidf):
+    top_terms_by_pillar = {}
+    for pil in ["Pillar 1", "Pillar 2", "Pillar 3", "Pillar 4", "Pillar 5", "Pillar 6", "Pillar 7", "Pillar 8"]:
+        articles = country_data.loc[country_data["associated_pillar"] == pil, "article"]
+        top_terms_by_pillar[pil] = frequencies.top_terms(matrix, articles, stopwords_full, tfidf)
+
+    top_terms_df = pd.DataFrame({key: pd.Series(values, dtype = object) for key, values in top_terms_by_pillar.items()})
+    st.dataframe(
+        top_terms_df, 
+        hide_index=True,
+        use_container_width=True
+    )
+
+@st.fragment
+def pillar_results(form_key, label, country, column, country_data, stopwords_full, tfidf, period):
+    matrix = frequencies.load_matrix(country, column)
+    wordcloud_col1, wordcloud_col2 = st.columns(spec = [0.2, 0.8])
+
+    # Pillar selection for wordcloud
+    with wordcloud_col1: 
+        wordcloud_options = st.form(form_key)
+        with wordcloud_options:
+
+            pillar_w = st.selectbox(
+                "Select a thematic pillar from the list bellow:",
+                ["Pillar 1", "Pillar 2", "Pillar 3", "Pillar 4", "Pillar 5", "Pillar 6", "Pillar 7", "Pillar 8"]
+            )
+            pillar_subset = country_data.loc[country_data["associated_pillar"] == pillar_w]
+            submitted_wordcloud = st.form_submit_button("Show me the results!!")
+
+    # Pillar Results
+    with wordcloud_col2:
+        if submitted_wordcloud and pillar_subset.empty:
+            st.warning("No articles of this pillar were published during this period.")
+        elif submitted_wordcloud:
+
+            # Wordclouds are rendered once and then read from the disk cache, even by other sessions
+            wordcloud = wordclouds.get_wordcloud(
+                country, column, pillar_w, None, tfidf, stopwords_full, period,
+                lambda: frequencies.wordcloud_scores(matrix, pillar_subset["article"], stopwords_full, tfidf)
+            )
+            
+            st.markdown(f"<h4>Most frequent {label} in this Pillar</h4>", unsafe_allow_html = True)
+            st.image(wordcloud, use_column_width=True)
+
+            top_terms_by_sentiment = {}
+            for sent in ["Very Positive", "Positive", "Neutral", "Negative", "Very Negative"]:
+                articles = pillar_subset.loc[pillar_subset["impact_score_text"] == sent, "article"]
+                top_terms_by_sentiment[sent] = frequencies.top_terms(matrix, articles, stopwords_full, tfidf)
+
+            top_terms_df = pd.DataFrame({key: pd.Series(values, dtype = object) for key, values in top_terms_by_sentiment.items()})
+            st.markdown(f"<h4>Most frequent {label} in this Pillar by associated impact</h4>", unsafe_allow_html = True)
+            st.dataframe(
+                top_terms_df, 
+                hide_index=True,
+                use_container_width=True
+            )
+
+# Columns used by this page
+COLUMNS = ["article", "associated_pillar", "impact_score_text"]
+
 # Page config
 st.set_page_config(
     page_title = "Classification",
@@ -109,27 +175,33 @@ if st.session_state["country_track"]:
 
     st.markdown(f"<h2>{country}</h2>", unsafe_allow_html = True)
 
-    # Loading and subsetting data
-    country_data = pd.read_parquet(f"data/news-data/{country}_master.parquet.gzip")
-    country_data["published_date"] = pd.to_datetime(country_data['published_date'])
-    country_data["impact_score_text"] = (
-        country_data["impact_score"].map(
-            { 
-                0 : "Undefined",
-                1 : "Very Negative",
-                2 : "Negative",
-                3 : "Neutral",
-                4 : "Positive",
-                5 : "Very Positive",
-            }
+    # Publishing period of the analysis
+    date_range = catalog.manifest(country)["date_range"]
+    first_day  = pd.Timestamp(date_range["min"]).date()
+    last_day   = pd.Timestamp(date_range["max"]).date()
+    start_day, end_day = date_index.period(
+        st.date_input(
+            "Limit the analysis to a publishing period",
+            value     = (first_day, last_day),
+            min_value = first_day,
+            max_value = last_day,
+            key       = f"period_{country}"
         )
     )
-    country_data["week_start"] = (
-        country_data["published_date"]
-        .dt.to_period("W")
-        .apply(lambda x: x.start_time)
-    )
-    country_data["week_start"] = country_data["week_start"].dt.date
+
+    # Loading and subsetting data. The rows of a publishing period are found in the sorted date index. Texts
+    # are never loaded: every subset is a set of rows of the term-document matrices of the country
+    rows   = None
+    period = None
+    if (start_day, end_day) != (first_day, last_day):
+        rows   = date_index.rows_between(country, start_day, end_day)
+        period = (start_day, end_day)
+    country_data = loader.load_country(country, COLUMNS, rows = rows)
+    if country_data.empty:
+        st.warning("No articles were published during this period. Please select a different one.")
+        st.stop()
+    terms_matrix    = frequencies.load_matrix(country, "cleaned_text")
+    entities_matrix = frequencies.load_matrix(country, "entities")
 
     # Adding customized stopwords
     stopwords_full = stopwords.split() + [
@@ -145,98 +217,10 @@ if st.session_state["country_track"]:
     overview1, wordcloud1 = st.tabs(["Overview", "By Pillar"])
 
     with overview1:
-
-        top_terms_by_pillar = {}
-        for pil in ["Pillar 1", "Pillar 2", "Pillar 3", "Pillar 4", "Pillar 5", "Pillar 6", "Pillar 7", "Pillar 8"]:
-            texts = country_data[country_data["associated_pillar"] == pil].cleaned_text     
-            if tfidf:       
-                vectorizer = TfidfVectorizer(
-                    stop_words   = stopwords_full, 
-                    max_features = 25
-                )
-            else:
-                vectorizer = CountVectorizer(
-                    stop_words   = stopwords_full, 
-                    max_features = 25
-                )
-            top_words_vector = vectorizer.fit_transform(texts)            
-            term_frequencies = top_words_vector.sum(axis=0).A1
-            terms            = vectorizer.get_feature_names_out()            
-            top_terms        = sorted(zip(terms, term_frequencies), key=lambda x: x[1], reverse=True)
-            top_terms_by_pillar[pil] = [term for term, _ in top_terms]
-
-        top_terms_df = pd.DataFrame(top_terms_by_pillar)
-        st.dataframe(
-            top_terms_df, 
-            hide_index=True,
-            use_container_width=True
-        )
+        overview(terms_matrix, country_data, stopwords_full, tfidf)
     
     with wordcloud1:
-
-        wordcloud1_col1, wordcloud1_col2 = st.columns(spec = [0.2,0.8])
-
-        # Pillar selection for wordcloud
-        with wordcloud1_col1: 
-            wordcloud_options = st.form("wordcloud_options_1")
-            with wordcloud_options:
-
-                pillar_w1 = st.selectbox(
-                    "Select a thematic pillar from the list bellow:",
-                    ["Pillar 1", "Pillar 2", "Pillar 3", "Pillar 4", "Pillar 5", "Pillar 6", "Pillar 7", "Pillar 8"]
-                )
-                pillar_subset = (
-                    country_data.copy()
-                    .loc[country_data["associated_pillar"] == pillar_w1]
-                )
-                submitted_wordcloud_w1 = st.form_submit_button("Show me the results!!")
-
-        # Pillar Results
-        with wordcloud1_col2:
-            if submitted_wordcloud_w1:
-
-                preproc_texts = pillar_subset["cleaned_text"]
-                if tfidf:       
-                    vectorizer = TfidfVectorizer(
-                        stop_words = stopwords_full
-                    )
-                else:
-                    vectorizer = CountVectorizer(
-                        stop_words = stopwords_full
-                    )
-                freqmatrix   = vectorizer.fit_transform(preproc_texts)
-                scores       = dict(zip(vectorizer.get_feature_names_out(), freqmatrix.sum(axis=0).tolist()[0]))
-                wordcloud_1  = viz.wordcloud(scores, freqs = True)
-                
-                st.markdown("<h4>Most frequent terms used in this Pillar</h4>", unsafe_allow_html = True)
-                st.pyplot(wordcloud_1, use_container_width=True)
-
-                top_terms_by_sentiment = {}
-                for sent in ["Very Positive", "Positive", "Neutral", "Negative", "Very Negative"]:
-                    texts = pillar_subset[pillar_subset["impact_score_text"] == sent].cleaned_text     
-                    if tfidf:       
-                        vectorizer = TfidfVectorizer(
-                            stop_words   = stopwords_full, 
-                            max_features = 25
-                        )
-                    else:
-                        vectorizer = CountVectorizer(
-                            stop_words   = stopwords_full, 
-                            max_features = 25
-                        )
-                    top_words_vector = vectorizer.fit_transform(texts)            
-                    term_frequencies = top_words_vector.sum(axis=0).A1
-                    terms            = vectorizer.get_feature_names_out()            
-                    top_terms        = sorted(zip(terms, term_frequencies), key=lambda x: x[1], reverse=True)
-                    top_terms_by_sentiment[sent] = [term for term, _ in top_terms]
-
-                top_terms_df = pd.DataFrame(top_terms_by_sentiment)
-                st.markdown("<h4>Most frequent terms used in this Pillar by associated impact</h4>", unsafe_allow_html = True)
-                st.dataframe(
-                    top_terms_df, 
-                    hide_index=True,
-                    use_container_width=True
-                )
+        pillar_results("wordcloud_options_1", "terms used", country, "cleaned_text", country_data, stopwords_full, tfidf, period)
 
     st.markdown("----")
 
@@ -246,95 +230,7 @@ if st.session_state["country_track"]:
     overview2, wordcloud2 = st.tabs(["Overview", "By Pillar"])
 
     with overview2:
-
-        top_entities_by_pillar = {}
-        for pil in ["Pillar 1", "Pillar 2", "Pillar 3", "Pillar 4", "Pillar 5", "Pillar 6", "Pillar 7", "Pillar 8"]:
-            ents = country_data[country_data["associated_pillar"] == pil].entities
-            if tfidf:       
-                vectorizer = TfidfVectorizer(
-                    stop_words   = stopwords_full, 
-                    max_features = 25
-                )
-            else:
-                vectorizer = CountVectorizer(
-                    stop_words   = stopwords_full, 
-                    max_features = 25
-                )
-            top_entities_vector = vectorizer.fit_transform(ents)            
-            ents_frequencies    = top_entities_vector.sum(axis=0).A1
-            entities            = vectorizer.get_feature_names_out()            
-            top_ents            = sorted(zip(entities, ents_frequencies), key=lambda x: x[1], reverse=True)
-            top_entities_by_pillar[pil] = [ent for ent, _ in top_ents]
-
-        top_ents_df = pd.DataFrame(top_entities_by_pillar)
-        st.dataframe(
-            top_ents_df, 
-            hide_index=True,
-            use_container_width=True
-        )
+        overview(entities_matrix, country_data, stopwords_full, tfidf)
     
     with wordcloud2:
-
-        wordcloud2_col1, wordcloud2_col2 = st.columns(spec = [0.2, 0.8])
-
-        # Pillar selection for wordcloud
-        with wordcloud2_col1: 
-            wordcloud_options = st.form("wordcloud_options_2")
-            with wordcloud_options:
-
-                pillar_w2 = st.selectbox(
-                    "Select a thematic pillar from the list bellow:",
-                    ["Pillar 1", "Pillar 2", "Pillar 3", "Pillar 4", "Pillar 5", "Pillar 6", "Pillar 7", "Pillar 8"]
-                )
-                pillar_subset = (
-                    country_data.copy()
-                    .loc[country_data["associated_pillar"] == pillar_w2]
-                )
-                submitted_wordcloud_w2 = st.form_submit_button("Show me the results!!")
-
-        # Pillar Results
-        with wordcloud2_col2:
-            if submitted_wordcloud_w2:
-
-                entities = pillar_subset["entities"]
-                if tfidf:       
-                    vectorizer = TfidfVectorizer(
-                        stop_words   = stopwords_full
-                    )
-                else:
-                    vectorizer = CountVectorizer(
-                        stop_words   = stopwords_full
-                    )
-                freqmatrix_ents = vectorizer.fit_transform(entities)
-                scores_ents     = dict(zip(vectorizer.get_feature_names_out(), freqmatrix_ents.sum(axis=0).tolist()[0]))
-                wordcloud_2     = viz.wordcloud(scores_ents, freqs = True)
-                
-                st.markdown("<h4>Most frequent entities mentioned in this Pillar</h4>", unsafe_allow_html = True)
-                st.pyplot(wordcloud_2, use_container_width=True)
-
-                top_ents_by_sentiment = {}
-                for sent in ["Very Positive", "Positive", "Neutral", "Negative", "Very Negative"]:
-                    ents = pillar_subset[pillar_subset["impact_score_text"] == sent].entities     
-                    if tfidf:       
-                        vectorizer = TfidfVectorizer(
-                            stop_words   = stopwords_full, 
-                            max_features = 25
-                        )
-                    else:
-                        vectorizer = CountVectorizer(
-                            stop_words   = stopwords_full, 
-                            max_features = 25
-                        )
-                    top_ents_vector  = vectorizer.fit_transform(ents)            
-                    ents_frequencies = top_ents_vector.sum(axis=0).A1
-                    entities         = vectorizer.get_feature_names_out()            
-                    top_ents         = sorted(zip(entities, ents_frequencies), key=lambda x: x[1], reverse=True)
-                    top_ents_by_sentiment[sent] = [term for term, _ in top_ents]
-
-                top_ents_df = pd.DataFrame(top_ents_by_sentiment)
-                st.markdown("<h4>Most frequent entities mentioned in this Pillar by associated impact</h4>", unsafe_allow_html = True)
-                st.dataframe(
-                    top_ents_df, 
-                    hide_index=True,
-                    use_container_width=True
-                )
+        pillar_results("wordcloud_options_2", "entities mentioned", country, "entities", country_data, stopwords_full, tfidf, period)
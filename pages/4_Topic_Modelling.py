@@ -15,6 +15,9 @@ import gensim
 from gensim import corpora
 import pyLDAvis
 import pyLDAvis.gensim
+from tools import catalog
+from tools import date_index
+from tools import loader
 from tools import data_viz as viz
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.feature_extraction.text import CountVectorizer
@@ -26,6 +29,9 @@ if "country_track" not in st.session_state:
 def update_tracking(button_name):
     st.session_state[button_name] = True
 
+# Columns used by this page
+COLUMNS = ["cleaned_text"]
+
 # Page config
 st.set_page_config(
     page_title = "Classification",
@@ -131,27 +137,34 @@ if st.session_state["country_track"]:
 
     st.markdown(f"<h2>{country}</h2>", unsafe_allow_html = True)
 
-    # Loading and subsetting data
-    country_data = pd.read_parquet(f"data/news-data/{country}_master.parquet.gzip")
-    country_data["published_date"] = pd.to_datetime(country_data['published_date'])
-    country_data["impact_score_text"] = (
-        country_data["impact_score"].map(
-            { 
-                0 : "Undefined",
-                1 : "Very Negative",
-                2 : "Negative",
-                3 : "Neutral",
-                4 : "Positive",
-                5 : "Very Positive",
-            }
+    # Publishing period of the analysis
+    date_range = catalog.manifest(country)["date_range"]
+    first_day  = pd.Timestamp(date_range["min"]).date()
+    last_day   = pd.Timestamp(date_range["max"]).date()
+    start_day, end_day = date_index.period(
+        st.date_input(
+            "Limit the analysis to a publishing period",
+            value     = (first_day, last_day),
+            min_value = first_day,
+            max_value = last_day,
+            key       = f"period_{country}"
         )
     )
-    pillar_subset = (
-        country_data.copy()
-        .loc[country_data["associated_pillar"] == pillar]
+
+    # Loading and subsetting data. The rows of a publishing period are found in the sorted date index
+    rows = None
+    if (start_day, end_day) != (first_day, last_day):
+        rows = date_index.rows_between(country, start_day, end_day)
+    pillar_subset = loader.load_country(
+        country, 
+        COLUMNS, 
+        pillars    = [pillar], 
+        sentiments = sentiments if sentiments else None,
+        rows       = rows
     )
-    if sentiments:
-        pillar_subset = pillar_subset.loc[pillar_subset["impact_score_text"].isin(sentiments)]
+    if pillar_subset.empty:
+        st.warning("No articles matching your selection were published during this period. Please select a different one.")
+        st.stop()
 
     # Creating corpora
     input_text = pillar_subset.cleaned_text.to_list()
@@ -11,15 +11,74 @@ import re
 import pandas as pd
 import streamlit as st
 import streamlit.components.v1 as stc
+from tools import catalog
+from tools import date_index
+from tools import loader
+from tools import search
 
 if "country_track" not in st.session_state:
     st.session_state["country_track"] = False
 if "search_track" not in st.session_state:
     st.session_state["search_track"] = False
+if "search_query" not in st.session_state:
+    st.session_state["search_query"] = None
 
 def update_tracking(button_name):
     st.session_state[button_name] = True
 
+def turn_page(step):
+    st.session_state["search_page"] += step
+
+def reset_page():
+    st.session_state["search_page"] = 0
+
+def result_html(row, source):
+    content = ""
+    if isinstance(row.get("content"), str):
+        content = f"<p class='jtext'><strong>Content:</strong></p><p class='vdesc'>{row['content']}</p>"
+
+    return f"""
+            <div>
+                <h4>{row["title_trans"]}</h4>
+                <p class='jtext'><strong>Summary:</strong></p>
+                <p class='vdesc'>{row["summary"]}</h4>
+                {content}
+                <br>
+                <div class="row">
+                    <div class="column">
+                        <p class='jtext'><strong>Source:</strong> {source}</p>
+                    </div>
+                    <div class="column">
+                        <p class='jtext'><strong>Publishing date:</strong> {row["published_date"].strftime("%B %d, %Y")}</p>
+                    </div> 
+                </div>
+                <div class="row">
+                    <div class="column">
+                        <p class='jtext'><strong>Impact score:</strong> {row["impact_score_text"]}</p>
+                    </div>
+                    <div class="column">
+                        <p class='jtext'><strong>URL:</strong>
+                            <a href='{row["link"]}' target='_blank'>Click here to open in a new tab</a>
+                        </p>
+                    </div> 
+                </div>
+            </div>
+            """
+
+def result_source(row, result_country):
+    return row["domain_url"] if country != ALL_EU else f"{row['domain_url']} ({result_country})"
+
+# Columns used to filter and search the data. The remaining columns are only loaded for the articles
+# that matched a search, and the full content only when it is displayed
+COLUMNS        = ["published_date", "associated_pillar", "impact_score_text", "summary"]
+RESULT_COLUMNS = ["title_trans", "domain_url", "link"]
+
+# Number of results displayed per page
+PAGE_SIZES = [10, 20, 50, 100]
+
+# Option of the country list that searches every country at once
+ALL_EU = "All EU"
+
 # Page config
 st.set_page_config(
     page_title = "Search",
@@ -47,9 +106,9 @@ st.markdown(
     a few example on how to use the keywords input box to narrow your results.
     </p>
     <p class='jtext'>
-    Finally, due to the massive size
-    volume of the data, you also need to filter down your query to a specific thematic pillar and an associated
-    sentiment. Once you are ready, click on <b>SEARCH</b> to see the list of articles that matched your search.
+    Finally, you can also narrow down your query to specific thematic pillars, associated sentiments and a
+    publishing period. These filters are optional: leave them empty to search all the articles. Once you are
+    ready, click on <b>SEARCH</b> to see the list of articles that matched your search.
     </p>
     <p class='jtext'>
     Don't forget to click on the <b>Load the data!!</b> button after selecting a country.
@@ -90,32 +149,24 @@ with country_selec:
             "Slovakia",
             "Slovenia",
             "Spain",
-            "Sweden"
+            "Sweden",
+            ALL_EU
         ]
     )
     submitted = st.form_submit_button("Load the data!!")
     if submitted:
         update_tracking("country_track")
+        st.session_state["search_query"] = None
 
 if st.session_state["country_track"]:
 
     st.markdown(f"<h2>{country}</h2>", unsafe_allow_html = True)
 
-    # Loading data for country
-    country_data = pd.read_parquet(f"data/news-data/{country}_master.parquet.gzip")
-    country_data["published_date"] = pd.to_datetime(country_data['published_date'])
-    country_data["impact_score_text"] = (
-        country_data["impact_score"].map(
-            { 
-                0 : "Undefined",
-                1 : "Very Negative",
-                2 : "Negative",
-                3 : "Neutral",
-                4 : "Positive",
-                5 : "Very Positive",
-            }
-        )
-    )
+    # Countries searched and publishing period they cover
+    countries   = catalog.countries() if country == ALL_EU else [country]
+    date_ranges = [catalog.manifest(searched)["date_range"] for searched in countries]
+    first_day   = min(pd.Timestamp(dates["min"]) for dates in date_ranges).date()
+    last_day    = max(pd.Timestamp(dates["max"]) for dates in date_ranges).date()
 
     search_engine = st.container()
     with search_engine:
@@ -126,100 +177,187 @@ if st.session_state["country_track"]:
         with st.expander("Click here to see examples on how to use the Search Engine"):
             st.markdown(
                 """
-                <i>The search engine supports Regular Expressions when searching for keywords. See the following examples:</i>
+                <i>The search engine looks for whole words, regardless of upper or lower case. See the following examples:</i>
+                - <i>If you want to search for articles containing BOTH words "European" AND "funds" (but not necessarily together), 
+                you can type</i>:
+                ```
+                European funds
+                ```
+
                 - <i>If you want to search for articles containing the words "European" OR "funds", meaning that you only need ONE of 
                 these words to appear in the article, you can type</i>:
                 ```
-                European|funds
+                European OR funds
                 ```
 
-                - <i>If you want to search for articles containing BOTH words "European" AND "funds" (but not necessarily together), 
-                you can type</i>:
+                - <i>If you want to exclude the articles containing a word, add NOT (or a minus sign) before it. Parentheses can be
+                used to group words</i>:
+                ```
+                (court OR judge) NOT football
+                ```
+
+                - <i>If you want to search for every word starting with "judic" (judicial, judiciary...), you can type</i>:
                 ```
-                \\bEuropean\\b.*\\bfunds\\b|\\bfunds\\b.*\\bEuropean\\b
+                judic*
                 ```
 
                 - <i>If you want to search for articles containing an exact match of "European funds", you can type</i>:
                 ```
+                "European funds"
+                ```
+
+                - <i>If you want to search for articles where "court" and "bribery" appear at most 5 words apart, you can type</i>:
+                ```
+                court NEAR/5 bribery
+                ```
+
+                <i>Tick the <b>Regular expression</b> box to search the summaries with Regular Expressions instead, like</i>
+                ```
                 \\bEuropean\\s+funds\\b
                 ```
                 """, 
                 unsafe_allow_html = True
             )
         keywords = st.text_input("The following keywords:")
-        assoc_pillar = st.selectbox(
-            "Limit the search to a specific pillar",
-            ["Pillar "+str(n) for n in range(1,9)]
+        full_content = st.checkbox("Also search the full content of the articles")
+        regex_mode   = st.checkbox("Regular expression")
+        relevance    = st.checkbox("Sort the results by relevance", value = True)
+        assoc_pillars = st.multiselect(
+            "Limit the search to specific pillars (leave it empty to search all of them)",
+            ["Pillar "+str(n) for n in range(1,9)],
+            default = ["Pillar 1"]
+        )
+        assoc_sentiments = st.multiselect(
+            "Limit the search to specific sentiments (leave it empty to search all of them)",
+            ["Very Positive", "Positive", "Neutral", "Negative", "Very Negative"],
+            default = ["Very Positive"]
         )
-        assoc_sentiment = st.selectbox(
-            "Limit the search to a specific sentiment",
-            ["Very Positive", "Positive", "Neutral", "Negative", "Very Negative"]
+        start_day, end_day = date_index.period(
+            st.date_input(
+                "Limit the search to a publishing period",
+                value     = (first_day, last_day),
+                min_value = first_day,
+                max_value = last_day
+            )
         )
         search_button = st.button("Search")
 
+    # The search is kept in the session state, so the results survive the reruns triggered by the page
+    # buttons
     if search_button:
+        update_tracking("search_track")
+        st.session_state["search_query"] = {
+            "keywords"     : keywords,
+            "pillars"      : assoc_pillars if assoc_pillars else None,
+            "sentiments"   : assoc_sentiments if assoc_sentiments else None,
+            "dates"        : (
+                (start_day.isoformat(), end_day.isoformat())
+                if (start_day, end_day) != (first_day, last_day) else None
+            ),
+            "full_content" : full_content,
+            "regex_mode"   : regex_mode,
+            "relevance"    : relevance and not regex_mode
+        }
+        reset_page()
 
-        session_state = True
-
-        # Transforming keywords
-        keys = []
-        keywords = re.sub(" OR ", "|", keywords)
-        for key in keywords.split():
-            regexkey = f"(?=.*{key})"
-            keys.append(regexkey)
-        keys = "^" + "".join(keys)
-        
-        # Filtering results
-        filtered_data = (
-            country_data.copy()
-            .loc[(country_data["associated_pillar"] == assoc_pillar) & (country_data["impact_score_text"] == assoc_sentiment)]
-        )
-        results = filtered_data[filtered_data["summary"].str.contains(keys, case = False)]
+    if st.session_state["search_query"] is not None:
+
+        query      = st.session_state["search_query"]
+        keywords   = query["keywords"]
+        pillars    = query["pillars"]
+        sentiments = query["sentiments"]
+        mode       = search.search_mode(query["regex_mode"], query["full_content"])
+
+        # Results are only ranked (or taken in order) up to the end of the current page
+        page_size = st.session_state.get("page_size", PAGE_SIZES[1])
+        k         = (st.session_state["search_page"] + 1) * page_size
+
+        # Searching the data, unless the same search was already run by this or any other session
+        try:
+            if country == ALL_EU:
+
+                # Countries are searched in parallel. As each one finishes, the progress is updated and the
+                # best results found so far are displayed, read by the workers along with the rows
+                progress = st.progress(0.0)
+                preview  = st.empty()
+                shards   = []
+                for shard in search.search_countries(
+                    countries, keywords, pillars, sentiments, query["dates"], mode, k, query["relevance"],
+                    columns = COLUMNS + RESULT_COLUMNS
+                ):
+                    shards.append(shard)
+                    progress.progress(
+                        len(shards) / len(countries),
+                        text = (
+                            f"Searched {len(shards)} of {len(countries)} countries: "
+                            f"{sum(shard[1] for shard in shards)} results so far"
+                        )
+                    )
+                    displayed = {found[0]: found[5] for found in shards}
+                    with preview.container():
+                        for result_country, index in search.merge_shards(
+                            shards, countries, k, query["relevance"]
+                        )[k - page_size:]:
+                            row = displayed[result_country].loc[index]
+                            st.markdown(result_html(row, result_source(row, result_country)), unsafe_allow_html = True)
+                            st.markdown("---")
+                preview.empty()
+                progress.empty()
+
+            else:
+                shards = [
+                    search.search_country(
+                        country, keywords, pillars, sentiments, query["dates"], mode, k, query["relevance"]
+                    )
+                ]
+        except re.error as error:
+            st.error(f"The regular expression is not valid: {error}")
+            st.stop()
+        except TimeoutError:
+            st.error(
+                "The regular expression took too long to run and was cancelled. Please try a simpler pattern."
+            )
+            st.stop()
 
         # Success Box
-        nresults = len(results.index)
+        nresults = sum(shard[1] for shard in shards)
         st.success(f"Your search returned {nresults} results.")
 
-        for index, row in results.iterrows():
+        page_size = st.selectbox("Results per page", PAGE_SIZES, index = 1, key = "page_size", on_change = reset_page)
+        npages    = max(-(-nresults // page_size), 1)
+        page      = min(st.session_state["search_page"], npages - 1)
+        start     = page * page_size
+        entries   = search.merge_shards(shards, countries, start + page_size, query["relevance"])[start:]
 
+        # Terms highlighted in the snippets. They come from the query, so they are the same in every country
+        terms = shards[0][4] if shards else []
+
+        # Only the rows of the current page are read. In the All EU mode, the workers already returned them
+        results = {shard[0]: shard[5] for shard in shards if shard[5] is not None}
+        for result_country in dict.fromkeys(entry[0] for entry in entries):
+            if result_country not in results:
+                rows = [row for entry_country, row in entries if entry_country == result_country]
+                results[result_country] = search.display_rows(
+                    result_country, rows, terms, mode, COLUMNS + RESULT_COLUMNS
+                )
+
+        for result_country, index in entries:
+
+            row = results[result_country].loc[index]
             with st.container():
-                title   = row["title_trans"]
-                sumdesc = row["summary"]
-                body    = row["content_trans"]
-                score   = row["impact_score_text"]
-                date    = row["published_date"].strftime("%B %d, %Y")
-                source  = row["domain_url"]
-                link    = row["link"]
-
-                variable_html_layout = f"""
-                                    <div>
-                                        <h4>{title}</h4>
-                                        <p class='jtext'><strong>Summary:</strong></p>
-                                        <p class='vdesc'>{sumdesc}</h4>
-                                        <br>
-                                        <div class="row">
-                                            <div class="column">
-                                                <p class='jtext'><strong>Source:</strong> {source}</p>
-                                            </div>
-                                            <div class="column">
-                                                <p class='jtext'><strong>Publishing date:</strong> {date}</p>
-                                            </div> 
-                                        </div>
-                                        <div class="row">
-                                            <div class="column">
-                                                <p class='jtext'><strong>Impact score:</strong> {score}</p>
-                                            </div>
-                                            <div class="column">
-                                                <p class='jtext'><strong>URL:</strong>
-                                                    <a href='{link}' target='_blank'>Click here to open in a new tab</a>
-                                                </p>
-                                            </div> 
-                                        </div>
-                                    </div>
-                                    """
-            
-                st.markdown(variable_html_layout, unsafe_allow_html = True)
-                with st.expander("Full content"):
+                st.markdown(result_html(row, result_source(row, result_country)), unsafe_allow_html = True)
+
+                # The full content is only read and sent to the browser once it is requested
+                if st.checkbox("Show full content", key = f"content_{result_country}_{index}"):
+                    body = loader.load_text(result_country, "content_trans", [row["article"]]).iloc[0]
                     stc.html(body, scrolling = True)
                 
-                st.markdown("---")
\ No newline at end of file
+                st.markdown("---")
+        # Page navigation
+        previous_col, page_col, next_col = st.columns(3)
+        with previous_col:
+            st.button("Previous page", on_click = turn_page, args = (-1,), disabled = page == 0)
+        with page_col:
+            st.markdown(f"<p style='text-align: center;'>Page {page + 1} of {npages}</p>", unsafe_allow_html = True)
+        with next_col:
+            st.button("Next page", on_click = turn_page, args = (1,), disabled = page >= npages - 1)
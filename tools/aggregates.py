@@ -0,0 +1,180 @@
+"""
+Project:        EU ROL Tracker Dashboard
+Module Name:    Precomputed Aggregates
+Author:         Carlos Alberto Toruño Paniagua
+Creation Date:  October 17th, 2026
+Description:    This module contains the code that precomputes the aggregates displayed in the Classification
+                Results tab. They are built by tools/ingest.py and stored next to the data store, so the page
+                never has to touch article-level data.
+"""
+
+import os
+
+import pandas as pd
+
+from tools import date_index
+from tools import loader
+from tools import pillar_flags
+from tools import time_buckets
+
+# Tables included in the Classification Results bundle. The daily tables hold the same counts per
+# publishing day, sorted by day, so the aggregates of any publishing period can be rebuilt from a slice
+CLASSIFICATION_TABLES = [
+    "per_pillar",
+    "per_week",
+    "per_week_total",
+    "cooccurrence",
+    "daily_pillar",
+    "daily_week",
+    "daily_cooccurrence"
+]
+
+
+def classification_path(country):
+    return f"{loader.store_path(country)}/classification"
+
+
+def _per_pillar(daily_pillar):
+    # Number of articles per pillar and impact score
+    per_pillar = (
+        daily_pillar
+        .groupby(["associated_pillar", "impact_score", "impact_score_text"], observed = True)
+        .agg(n_articles=("n_articles", "sum"))
+        .reset_index()
+    )
+    per_pillar["pillar_order"] = per_pillar["associated_pillar"].cat.codes + 1
+    per_pillar["share"] = (per_pillar["n_articles"] / per_pillar.groupby("associated_pillar", observed = True)["n_articles"].transform("sum"))*100
+    return per_pillar.sort_values(["pillar_order", "impact_score"], ascending=[True, False])
+
+
+def _per_week(daily_week):
+    # Number of articles per week and impact score, and in total
+    per_week = (
+        daily_week
+        .groupby(["week_start", "impact_score", "impact_score_text"], observed = True)
+        .agg(n_articles=("n_articles", "sum"))
+        .reset_index()
+        .sort_values(["week_start", "impact_score"])
+    )
+    per_week_total = (
+        per_week
+        .groupby(["week_start"])
+        .agg(
+            n_articles = ("n_articles", "sum")
+        )
+        .reset_index()
+    )
+    return per_week, per_week_total
+
+
+def _cooccurrence(daily_cooccurrence):
+    return pillar_flags.cooccurrence(daily_cooccurrence["pillars"], daily_cooccurrence["n_articles"])
+
+
+def build_classification(articles, article_pillars):
+    """
+    Computes the aggregates of the Classification Results tab from the tables of the data store. The pillar
+    rows must be in the order of the master file (see tools/ingest.py), which decides the first pillar of
+    every article.
+    """
+
+    days = time_buckets.bucket(articles["published_date"], "day")
+
+    # Number of articles per day, pillar and impact score
+    scored = article_pillars.loc[article_pillars["impact_score"] > 0]
+    scored["day"] = days.take(scored["article"]).to_numpy()
+    daily_pillar = (
+        scored
+        .groupby(["day", "associated_pillar", "impact_score", "impact_score_text"], observed = True, dropna = False)
+        .agg(n_articles=("article", "count"))
+        .reset_index()
+    )
+
+    # Number of articles per day and impact score. Each article is counted once, with the impact score of
+    # its first associated pillar
+    first_pillar = scored.drop_duplicates(subset = "article")
+    first_pillar["week_start"] = articles["week_start"].take(first_pillar["article"]).to_numpy()
+    daily_week = (
+        first_pillar
+        .groupby(["day", "week_start", "impact_score", "impact_score_text"], observed = True, dropna = False)
+        .agg(n_articles=("article", "count"))
+        .reset_index()
+    )
+
+    # Number of articles per day and combination of pillars, for the co-occurrence between pillars
+    daily_cooccurrence = (
+        pd.DataFrame({"day": days.to_numpy(), "pillars": articles["pillars"].to_numpy()})
+        .groupby(["day", "pillars"], dropna = False)
+        .agg(n_articles=("pillars", "size"))
+        .reset_index()
+    )
+
+    per_week, per_week_total = _per_week(daily_week)
+    return {
+        "per_pillar"         : _per_pillar(daily_pillar),
+        "per_week"           : per_week,
+        "per_week_total"     : per_week_total,
+        "cooccurrence"       : _cooccurrence(daily_cooccurrence),
+        "daily_pillar"       : daily_pillar,
+        "daily_week"         : daily_week,
+        "daily_cooccurrence" : daily_cooccurrence
+    }
+
+
+def classification_window(bundle, start, end):
+    """
+    Rebuilds the aggregates of the Classification Results tab for the articles published between two days
+    (both included). Each daily table is sorted by day, so the period is a slice found by binary search.
+    """
+
+    daily = {
+        table: bundle[table].iloc[date_index.between(bundle[table]["day"].to_numpy(), start, end)]
+        for table in ["daily_pillar", "daily_week", "daily_cooccurrence"]
+    }
+    per_week, per_week_total = _per_week(daily["daily_week"])
+    return {
+        "per_pillar"     : _per_pillar(daily["daily_pillar"]),
+        "per_week"       : per_week,
+        "per_week_total" : per_week_total,
+        "cooccurrence"   : _cooccurrence(daily["daily_cooccurrence"])
+    }
+
+
+def write_classification(country, bundle):
+    path = classification_path(country)
+    os.makedirs(path, exist_ok = True)
+    for table in CLASSIFICATION_TABLES:
+        bundle[table].to_parquet(f"{path}/{table}.parquet")
+
+
+def _read_classification(country):
+    path = classification_path(country)
+    loader.check_store(country, f"{path}/per_pillar.parquet")
+    bundle = {}
+    for table in CLASSIFICATION_TABLES:
+        bundle[table] = pd.read_parquet(f"{path}/{table}.parquet")
+    return bundle
+
+
+def load_classification(country, start = None, end = None):
+    """
+    Returns the aggregates of the Classification Results tab, for the whole data or only for the articles
+    published between two days.
+    """
+
+    bundle = loader.load_artifact(("classification", country), lambda: _read_classification(country))
+    if start is not None:
+        bundle = classification_window(bundle, start, end)
+
+    # Shallow copies, so that pages can relabel or modify the tables without touching the cached ones
+    return {table: data.copy(deep = False) for table, data in bundle.items()}
+
+
+def count_articles(country, start, end):
+    """
+    Returns the number of articles published between two days (both included).
+    """
+
+    bundle = loader.load_artifact(("classification", country), lambda: _read_classification(country))
+    daily  = bundle["daily_cooccurrence"]
+    return int(daily["n_articles"].iloc[date_index.between(daily["day"].to_numpy(), start, end)].sum())
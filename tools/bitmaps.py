@@ -0,0 +1,117 @@
+"""
+Project:        EU ROL Tracker Dashboard
+Module Name:    Filter Bitmaps
+Author:         Carlos Alberto Toruño Paniagua
+Creation Date:  October 17th, 2026
+Description:    This module contains the bitmap indexes used to filter the rows of the article_pillars table.
+                For every pillar and sentiment, tools/ingest.py stores a bitmap with one bit
+                per row (packed with NumPy, 8 rows per byte). Any combination of filters is then a few
+                bitwise OR (values of the same filter) and AND (different filters) over small arrays, and
+                the rows matched by a search are checked against the result one bit at a time. Publishing
+                periods are resolved by tools/date_index.py into bitmaps of the same layout.
+"""
+
+import os
+
+import numpy as np
+
+from tools import loader
+
+DIMENSIONS = ["pillar", "sentiment"]
+
+
+def bitmaps_path(country):
+    return f"{loader.store_path(country)}/bitmaps"
+
+
+def _packed(codes, n_values):
+    # One row of bits per value, with a bit set for every row of the table holding that value
+    valid = codes >= 0
+    bits  = np.zeros((n_values, len(codes)), dtype = bool)
+    bits[codes[valid], np.flatnonzero(valid)] = True
+    return np.packbits(bits, axis = 1)
+
+
+def build_bitmaps(article_pillars):
+    """
+    Builds the bitmaps of every pillar and sentiment over the rows of the article_pillars table. Returns
+    the labels and the packed bitmaps of every dimension.
+    """
+
+    return {
+        "pillar" : (
+            np.array(loader.PILLARS),
+            _packed(article_pillars["associated_pillar"].cat.codes.to_numpy(), len(loader.PILLARS))
+        ),
+        "sentiment" : (
+            np.array(list(loader.IMPACT_SCORES.values())),
+            _packed(article_pillars["impact_score"].to_numpy().astype(np.int64), len(loader.IMPACT_SCORES))
+        )
+    }
+
+
+def write_bitmaps(country, bitmaps):
+    path = bitmaps_path(country)
+    os.makedirs(path, exist_ok = True)
+    for dimension, (labels, packed) in bitmaps.items():
+        np.save(f"{path}/{dimension}_labels.npy", labels)
+        np.save(f"{path}/{dimension}.npy", packed)
+
+
+def _read_bitmaps(country):
+    path = bitmaps_path(country)
+    loader.check_store(country, f"{path}/pillar.npy")
+    bitmaps = {}
+    for dimension in DIMENSIONS:
+        labels = np.load(f"{path}/{dimension}_labels.npy").tolist()
+        bitmaps[dimension] = (
+            {label: position for position, label in enumerate(labels)},
+            np.load(f"{path}/{dimension}.npy", mmap_mode = "r")
+        )
+    return bitmaps
+
+
+def load_bitmaps(country):
+    return loader.load_artifact(("bitmaps", country), lambda: _read_bitmaps(country))
+
+
+def select(country, pillars = None, sentiments = None):
+    """
+    Returns the packed bitmap of the rows matching the filters. Rows must hold one of the values of every
+    filter given, and filters left as None are not applied.
+    """
+
+    bitmaps = load_bitmaps(country)
+    result  = None
+    for dimension, values in zip(DIMENSIONS, [pillars, sentiments]):
+        if values is None:
+            continue
+        positions, packed = bitmaps[dimension]
+        selected = [positions[value] for value in values if value in positions]
+        if selected:
+            mask = np.bitwise_or.reduce(packed[selected], axis = 0)
+        else:
+            mask = np.zeros(packed.shape[1], dtype = np.uint8)
+        result = mask if result is None else result & mask
+
+    if result is None:
+        _, packed = bitmaps["pillar"]
+        result = np.full(packed.shape[1], 255, dtype = np.uint8)
+    return result
+
+
+def contains(mask, rows):
+    """
+    Returns a boolean array telling which rows have their bit set in a packed bitmap.
+    """
+
+    rows = np.asarray(rows, dtype = np.int64)
+    return ((mask[rows >> 3] >> (7 - (rows & 7))) & 1).astype(bool)
+
+
+def to_rows(mask, n_rows):
+    """
+    Returns the sorted rows whose bit is set in a packed bitmap.
+    """
+
+    return np.flatnonzero(np.unpackbits(mask, count = n_rows))
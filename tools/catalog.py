@@ -0,0 +1,98 @@
+"""
+Project:        EU ROL Tracker Dashboard
+Module Name:    Data Catalog
+Author:         Carlos Alberto Toruño Paniagua
+Creation Date:  October 17th, 2026
+Description:    This module contains the per-country manifests written by tools/ingest.py. A manifest holds
+                the metadata displayed in the page headers (sources, date range, article counts) along with
+                the checksums of the files it was built from, so headers render without loading any article.
+"""
+
+import glob
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+
+from tools import loader
+
+
+def manifest_path(country):
+    return f"{loader.store_path(country)}/manifest.json"
+
+
+def file_checksum(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024**2), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_manifest(country, articles, article_pillars):
+    """
+    Builds the manifest of a country from its tables. It must be called once every file of the data store
+    has been written, so their checksums are up to date.
+    """
+
+    per_pillar = (
+        article_pillars
+        .groupby("associated_pillar", observed = False)
+        .agg(n_articles = ("article", "count"))["n_articles"]
+    )
+
+    # Checksums of the master file and of every file in the data store
+    files = [loader.master_path(country)] + sorted(
+        path for path in glob.glob(f"{loader.store_path(country)}/**/*", recursive = True)
+        if os.path.isfile(path) and path != manifest_path(country)
+    )
+
+    return {
+        "country"    : country,
+        "built_at"   : datetime.now(timezone.utc).isoformat(timespec = "seconds"),
+        "sources"    : articles["domain_url"].drop_duplicates().to_list(),
+        "date_range" : {
+            "min" : articles["published_date"].min().isoformat(),
+            "max" : articles["published_date"].max().isoformat()
+        },
+        "n_articles"    : len(articles),
+        "n_pillar_rows" : len(article_pillars),
+        "per_pillar"    : {pillar: int(n) for pillar, n in per_pillar.items()},
+        "checksums"     : {path: file_checksum(path) for path in files}
+    }
+
+
+def write_manifest(country, manifest):
+    with open(manifest_path(country), "w") as file:
+        json.dump(manifest, file, indent = 2)
+
+
+def _read_manifest(country):
+    loader.check_store(country, manifest_path(country))
+    with open(manifest_path(country), "r") as file:
+        return json.load(file)
+
+
+def version(country):
+    """
+    Returns the version of the data store of a country: the modification time of its manifest, which is
+    written last by tools/ingest.py. It is read from disk every time, so it changes as soon as the data
+    store is rebuilt, even under a running server.
+    """
+
+    loader.check_store(country, manifest_path(country))
+    return os.stat(manifest_path(country)).st_mtime_ns
+
+
+def manifest(country):
+    # The version is part of the key, so a rebuilt data store gets its new manifest
+    return loader.load_artifact(("manifest", country, version(country)), lambda: _read_manifest(country))
+
+
+def countries():
+    """
+    Returns the countries whose data store has been built.
+    """
+
+    paths = glob.glob(f"{loader.STORE_PATH}/*/manifest.json")
+    return sorted(os.path.basename(os.path.dirname(path)) for path in paths)
@@ -6,12 +6,12 @@ Creation Date:  November 4th, 2024
 Description:    This module contains the code for the different data viz used in the app
 """
 
+import io
 import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from wordcloud import WordCloud
-import matplotlib.pyplot as plt
 
 
 def dynamic_pie(data):
@@ -208,9 +208,12 @@ def sliderline(df):
         title_x = 0.5
     )
     combined_plot['layout'].pop("sliders")
-    combined_plot.layout.updatemenus[0].buttons[0]['args'][1]['frame']['duration'] = 120
-    combined_plot.layout.updatemenus[0].buttons[0]['args'][1]['transition']['duration'] = 50
-    combined_plot.layout.updatemenus[0].buttons[0]['args'][1]['transition']['redraw'] = False
+
+    # A publishing period of a single week has nothing to animate, so there are no play buttons
+    if combined_plot.layout.updatemenus:
+        combined_plot.layout.updatemenus[0].buttons[0]['args'][1]['frame']['duration'] = 120
+        combined_plot.layout.updatemenus[0].buttons[0]['args'][1]['transition']['duration'] = 50
+        combined_plot.layout.updatemenus[0].buttons[0]['args'][1]['transition']['redraw'] = False
 
     return combined_plot
 
@@ -248,9 +251,9 @@ def wordcloud(input, freqs = True):
             background_color = "white"
         ).generate(" ".join(input))
 
-    # Display the word cloud using matplotlib
-    plt.figure(figsize = (10, 5))
-    plt.imshow(wordcloud, interpolation = "bilinear")
-    plt.axis("off")
+    # The PNG is encoded straight from the WordCloud array: no matplotlib figure is created, so nothing
+    # piles up in the pyplot registry of the server process
+    image = io.BytesIO()
+    wordcloud.to_image().save(image, format = "PNG")
 
-    return plt
\ No newline at end of file
+    return image.getvalue()
\ No newline at end of file
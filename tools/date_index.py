@@ -0,0 +1,85 @@
+"""
+Project:        EU ROL Tracker Dashboard
+Module Name:    Date Index
+Author:         Carlos Alberto Toruño Paniagua
+Creation Date:  October 17th, 2026
+Description:    This module contains the sorted date index used to restrict the pages to a publishing period.
+                The article_pillars table is sorted by pillar and impact score, so tools/ingest.py stores
+                next to it the publishing day of every row in ascending order, along with the position of
+                each of those rows. A period is then found with two binary searches and the matching rows
+                are a contiguous slice of the index, so a narrow period never scans the whole country.
+"""
+
+import os
+
+import numpy as np
+
+from tools import loader
+
+
+def date_index_path(country):
+    return f"{loader.store_path(country)}/dates"
+
+
+def build_date_index(articles, article_pillars):
+    """
+    Sorts the rows of the article_pillars table by publishing day. Returns the sorted days and the
+    position of every row in that order (rows published on the same day keep their order in the table).
+    """
+
+    days  = articles["published_date"].to_numpy().astype("datetime64[D]").take(article_pillars["article"].to_numpy())
+    order = np.argsort(days, kind = "stable")
+
+    # Rows without a publishing date can not fall in any period
+    order = order[~np.isnat(days[order])]
+    return {
+        "days" : days[order],
+        "rows" : order.astype(np.int32)
+    }
+
+
+def write_date_index(country, date_index):
+    path = date_index_path(country)
+    os.makedirs(path, exist_ok = True)
+    for name, values in date_index.items():
+        np.save(f"{path}/{name}.npy", values)
+
+
+def _read_date_index(country):
+    path = date_index_path(country)
+    loader.check_store(country, f"{path}/days.npy")
+    return {name: np.load(f"{path}/{name}.npy", mmap_mode = "r") for name in ["days", "rows"]}
+
+
+def load_date_index(country):
+    return loader.load_artifact(("date_index", country), lambda: _read_date_index(country))
+
+
+def period(value):
+    """
+    Returns the (start, end) days of the value of a date range input. While the user is still picking the
+    range, the input only holds its first day, which is then used as both ends.
+    """
+
+    days = list(value) if isinstance(value, (list, tuple)) else [value]
+    return days[0], days[-1]
+
+
+def between(days, start, end):
+    """
+    Returns the slice of a sorted array of days that falls between two days (both included).
+    """
+
+    first = np.searchsorted(days, np.datetime64(start, "D"), side = "left")
+    last  = np.searchsorted(days, np.datetime64(end, "D"), side = "right")
+    return slice(first, last)
+
+
+def rows_between(country, start, end):
+    """
+    Returns the sorted positions of the article_pillars rows published between two days (both included).
+    """
+
+    date_index = load_date_index(country)
+    return np.sort(date_index["rows"][between(date_index["days"], start, end)])
+
@@ -0,0 +1,204 @@
+"""
+Project:        EU ROL Tracker Dashboard
+Module Name:    Term Frequencies
+Author:         Carlos Alberto Toruño Paniagua
+Creation Date:  October 17th, 2026
+Description:    This module contains the frequency engine of the Frequency Analysis tab. The cleaned_text and
+                entities columns of a country are tokenized only once into a sparse term-document matrix
+                (one row per article, one column per term of the vocabulary), which is shared by every
+                session. The counts and TF-IDF weights of any set of articles, e.g. a pillar or a sentiment,
+                are then computed by slicing the rows of that matrix and adding up its columns, giving the
+                same results as fitting a CountVectorizer or TfidfVectorizer on their texts.
+
+                Stopwords are a boolean mask over the vocabulary. The statistics of every set of articles
+                that do not depend on them (counts, IDF, norms) are cached, so editing the stopwords only
+                masks those statistics and reweights the few columns involved, instead of refitting anything.
+
+                The matrices are built by tools/ingest.py and stored in the data store as plain NumPy arrays
+                (the CSR data, indices and row pointers, plus the vocabulary), which are memory-mapped, so
+                no text is ever tokenized by the dashboard itself.
+"""
+
+import hashlib
+import os
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.preprocessing import normalize
+
+from tools import loader
+
+# Text columns of the articles table with a term-document matrix
+FREQUENCY_COLUMNS = ["cleaned_text", "entities"]
+
+
+def build_matrix(texts):
+    """
+    Tokenizes some texts, just like the vectorizers of the Frequency Analysis tab. Returns the sorted
+    vocabulary and the CSR matrix with the number of times every term appears in every text.
+    """
+
+    vectorizer = CountVectorizer()
+    counts     = vectorizer.fit_transform(texts.fillna("")).tocsr()
+    return {
+        "vocabulary" : vectorizer.get_feature_names_out(),
+        "counts"     : counts
+    }
+
+
+def build_matrices(articles):
+    return {column: build_matrix(articles[column]) for column in FREQUENCY_COLUMNS}
+
+
+def frequencies_path(country, column):
+    return f"{loader.store_path(country)}/frequencies/{column}"
+
+
+def write_matrices(country, matrices):
+    for column, matrix in matrices.items():
+        path = frequencies_path(country, column)
+        os.makedirs(path, exist_ok = True)
+
+        # The vocabulary is stored as a single UTF-8 blob, one term per line. Counts always fit in 32 bits
+        blob = "\n".join(matrix["vocabulary"]).encode("utf-8")
+        np.save(f"{path}/vocabulary.npy", np.frombuffer(blob, dtype = np.uint8))
+        np.save(f"{path}/data.npy", matrix["counts"].data.astype(np.int32))
+        np.save(f"{path}/indices.npy", matrix["counts"].indices)
+        np.save(f"{path}/indptr.npy", matrix["counts"].indptr)
+
+
+def _read_matrix(country, column):
+    path = frequencies_path(country, column)
+    loader.check_store(country, f"{path}/vocabulary.npy")
+
+    vocabulary = np.load(f"{path}/vocabulary.npy").tobytes().decode("utf-8")
+    vocabulary = np.array(vocabulary.split("\n") if vocabulary else [], dtype = object)
+
+    # The matrix points to the memory-mapped arrays, nothing is copied
+    indptr = np.load(f"{path}/indptr.npy", mmap_mode = "r")
+    counts = sparse.csr_matrix(
+        (
+            np.load(f"{path}/data.npy", mmap_mode = "r"),
+            np.load(f"{path}/indices.npy", mmap_mode = "r"),
+            indptr
+        ),
+        shape = (len(indptr) - 1, len(vocabulary)),
+        copy  = False
+    )
+    return {
+        "key"        : ("term_matrix", country, column),
+        "vocabulary" : vocabulary,
+        "lookup"     : {term: position for position, term in enumerate(vocabulary)},
+        "counts"     : counts
+    }
+
+
+def load_matrix(country, column):
+    if column not in FREQUENCY_COLUMNS:
+        raise ValueError(f"There is no term-document matrix for {column}")
+    return loader.load_artifact(("term_matrix", country, column), lambda: _read_matrix(country, column))
+
+
+def stopword_mask(matrix, stopwords):
+    """
+    Returns a boolean array telling which terms of the vocabulary are not stopwords.
+    """
+
+    keep = np.ones(len(matrix["vocabulary"]), dtype = bool)
+    keep[[matrix["lookup"][word] for word in stopwords if word in matrix["lookup"]]] = False
+    return keep
+
+
+def _read_subset(matrix, articles):
+    counts = matrix["counts"][articles]
+    totals = np.asarray(counts.sum(axis = 0)).ravel()
+
+    # Smoothed IDF of every term, as the vectorizers compute it on the articles of the subset
+    by_term = counts.tocsc()
+    df      = np.diff(by_term.indptr).astype(np.float64)
+    idf     = np.full(counts.shape[1], counts.shape[0] + 1, dtype = np.float64)
+    idf    /= df + 1
+    idf     = np.log(idf) + 1
+
+    # Squared L2 norm of the TF-IDF weights of every article, over the whole vocabulary
+    rows    = np.repeat(np.arange(counts.shape[0]), np.diff(counts.indptr))
+    squares = np.bincount(rows, weights = (counts.data * idf[counts.indices])**2, minlength = counts.shape[0])
+    return {
+        "by_term" : by_term,
+        "totals"  : totals,
+        "idf"     : idf,
+        "squares" : squares
+    }
+
+
+def load_subset(matrix, articles):
+    """
+    Returns the statistics of some articles that do not depend on the stopwords: their counts (sliced by
+    term), the total count, the IDF of every term and the norms of the articles. They are cached, so
+    editing the stopwords only masks them.
+    """
+
+    articles = np.asarray(articles, dtype = np.int64)
+    digest   = hashlib.sha1(articles.tobytes()).hexdigest()
+    return loader.load_artifact(matrix["key"] + (digest,), lambda: _read_subset(matrix, articles))
+
+
+def term_scores(matrix, articles, stopwords, tfidf, max_features = None):
+    """
+    Returns the terms found in some articles (given by their position in the articles table, repeated if
+    needed) along with their total count or TF-IDF weight, in alphabetical order. With max_features, only
+    the most frequent terms are kept and weighted, as the vectorizers do.
+    """
+
+    subset = load_subset(matrix, articles)
+    totals = subset["totals"]
+    keep   = (totals > 0) & stopword_mask(matrix, stopwords)
+    terms  = np.flatnonzero(keep)
+    if max_features is not None and len(terms) > max_features:
+        terms = np.sort(terms[(-totals[terms]).argsort()[:max_features]])
+
+    if not tfidf:
+        return matrix["vocabulary"][terms], totals[terms]
+
+    if max_features is not None:
+        # Only the columns of the terms kept are read, and the IDF and norms are computed on them alone
+        weights = subset["by_term"][:, terms].tocsr().astype(np.float64)
+        df      = np.bincount(weights.indices, minlength = len(terms)).astype(np.float64)
+        idf     = np.full(len(terms), weights.shape[0] + 1, dtype = np.float64)
+        idf    /= df + 1
+        idf     = np.log(idf) + 1
+        weights.data *= idf[weights.indices]
+        weights = normalize(weights, copy = False)
+        return matrix["vocabulary"][terms], np.asarray(weights.sum(axis = 0)).ravel()
+
+    # The norms of the articles are the cached ones, minus the weights of the stopwords they contain, so only
+    # the columns of the stopwords are read
+    stops   = subset["by_term"][:, np.flatnonzero((totals > 0) & ~keep)]
+    idf     = subset["idf"]
+    columns = np.repeat(np.flatnonzero((totals > 0) & ~keep), np.diff(stops.indptr))
+    removed = np.bincount(stops.indices, weights = (stops.data * idf[columns])**2, minlength = stops.shape[0])
+    norms   = np.sqrt(np.maximum(subset["squares"] - removed, 0))
+    norms[norms == 0] = 1
+
+    scores = idf[terms] * np.asarray(subset["by_term"][:, terms].T @ (1 / norms)).ravel()
+    return matrix["vocabulary"][terms], scores
+
+
+def top_terms(matrix, articles, stopwords, tfidf, k = 25):
+    """
+    Returns the k terms with the highest count or TF-IDF weight in some articles, from the highest to the
+    lowest. Ties keep the alphabetical order.
+    """
+
+    terms, scores = term_scores(matrix, articles, stopwords, tfidf, max_features = k)
+    return terms[np.argsort(-scores, kind = "stable")].tolist()
+
+
+def wordcloud_scores(matrix, articles, stopwords, tfidf):
+    """
+    Returns the count or TF-IDF weight of every term found in some articles, to draw a wordcloud.
+    """
+
+    terms, scores = term_scores(matrix, articles, stopwords, tfidf)
+    return dict(zip(terms.tolist(), scores.tolist()))
@@ -0,0 +1,216 @@
+"""
+Project:        EU ROL Tracker Dashboard
+Module Name:    Data Ingestion
+Author:         Carlos Alberto Toruño Paniagua
+Creation Date:  October 17th, 2026
+Description:    This module contains the ingest step that turns the master files into the normalized data
+                store read by the EU ROL Tracker Dashboard, along with the precomputed aggregates of the
+                Classification Results tab, the search index, filter bitmaps and date index, the term-document
+                matrices of the Frequency Analysis tab, and the manifest of every country. Run it from the
+                root of the repository:
+
+                    python -m tools.ingest                  # All countries with a master file
+                    python -m tools.ingest Estonia Latvia   # Only some countries
+                    python -m tools.ingest --format arrow   # Memory-mapped Arrow IPC tables
+"""
+
+import argparse
+import glob
+import os
+import shutil
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from tools import aggregates
+from tools import bitmaps
+from tools import catalog
+from tools import date_index
+from tools import frequencies
+from tools import loader
+from tools import pillar_flags
+from tools import search_index
+from tools import time_buckets
+
+
+# Rows per row group of the articles table in Parquet. Reading a few articles (e.g. the results of a search)
+# only decompresses the row groups holding them
+ARTICLES_ROW_GROUP = 4096
+
+
+def available_countries():
+    paths = glob.glob(f"{loader.DATA_PATH}/*_master.parquet.gzip")
+    return sorted(os.path.basename(path).replace("_master.parquet.gzip", "") for path in paths)
+
+
+def split_master(master):
+    """
+    Splits a master file, which holds one row per article and associated pillar, into an articles table
+    with one row per article and a thin article_pillars table pointing to it.
+    """
+
+    # The first row of every article is kept, just like the drop_duplicates(subset="id") calls in the pages
+    first_rows = ~master["id"].duplicated()
+    columns    = [col for col in loader.ARTICLE_COLUMNS if col in master.columns] + pillar_flags.FLAG_COLUMNS
+    articles   = master.loc[first_rows, columns].reset_index(drop = True)
+
+    # Pillar rows point to their article by position, so joins are a simple take() instead of a merge
+    positions = pd.Index(articles["id"]).get_indexer(master["id"]).astype("int32")
+    columns   = [col for col in loader.PILLAR_COLUMNS if col in master.columns]
+    article_pillars = master[columns].reset_index(drop = True)
+    article_pillars.insert(0, "article", positions)
+
+    return articles, article_pillars
+
+
+def add_derived_columns(articles, article_pillars):
+    """
+    Parses and derives, once and for all, the typed columns that the pages used to compute on every load,
+    using the most compact types that fit the data.
+    """
+
+    articles["published_date"] = pd.to_datetime(articles["published_date"])
+    articles["week_start"]     = time_buckets.bucket(articles["published_date"], "week")
+    articles["pillars"]        = pillar_flags.pack(articles)
+
+    article_pillars["impact_score"] = article_pillars["impact_score"].astype("int8")
+
+    article_pillars["associated_pillar"] = pd.Categorical(
+        article_pillars["associated_pillar"],
+        categories = loader.PILLARS
+    )
+    article_pillars["impact_score_text"] = pd.Categorical(
+        article_pillars["impact_score"].map(loader.IMPACT_SCORES),
+        categories = list(loader.IMPACT_SCORES.values())
+    )
+
+    # Keeping the same column order as the loader
+    articles        = articles[loader.ARTICLE_COLUMNS]
+    article_pillars = article_pillars[loader.PILLAR_COLUMNS]
+
+    return articles, article_pillars
+
+
+def sort_partitions(article_pillars):
+    """
+    Sorts the pillar rows by pillar and impact score (keeping the original order within each group), so
+    every combination can be written as its own row group.
+    """
+
+    return (
+        article_pillars
+        .sort_values(loader.PARTITION_KEYS, kind = "stable")
+        .reset_index(drop = True)
+    )
+
+
+def write_partitioned(data, path, keys):
+    """
+    Writes a table sorted by the key columns with one row group per combination of keys. The statistics
+    of every row group then tell the loader exactly which slice of the file matches a filter.
+    """
+
+    table  = pa.Table.from_pandas(data, preserve_index = False)
+    groups = data.groupby(keys, observed = True, sort = False).size()
+    with pq.ParquetWriter(path, table.schema, compression = "zstd") as writer:
+        start = 0
+        for size in groups:
+            writer.write_table(table.slice(start, size), row_group_size = size)
+            start += size
+
+
+def write_arrow(data, path, compression = None):
+    """
+    Writes a table as an Arrow IPC file. Uncompressed files can be memory-mapped without copying anything,
+    LZ4 files trade some of that for a smaller size on disk.
+    """
+
+    table   = pa.Table.from_pandas(data, preserve_index = False)
+    options = pa.ipc.IpcWriteOptions(compression = compression)
+    with pa.OSFile(path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema, options = options) as writer:
+            writer.write_table(table)
+
+
+def ingest_country(country, fmt = "parquet", compression = None):
+    master = pd.read_parquet(loader.master_path(country)).reset_index(drop = True)
+    articles, article_pillars = split_master(master)
+    articles, article_pillars = add_derived_columns(articles, article_pillars)
+
+    # Precomputed aggregates for the Classification Results tab. They count every article with its first
+    # pillar in the master file, so they are built before the pillar rows are sorted
+    classification  = aggregates.build_classification(articles, article_pillars)
+    article_pillars = sort_partitions(article_pillars)
+
+    # The data store of the country is rebuilt from scratch, so no stale file is left behind
+    shutil.rmtree(loader.store_path(country), ignore_errors = True)
+    os.makedirs(loader.store_path(country))
+
+    if fmt == "arrow":
+        write_arrow(articles, loader.table_path(country, "articles", "arrow"), compression)
+        write_arrow(article_pillars, loader.table_path(country, "article_pillars", "arrow"), compression)
+    else:
+        articles.to_parquet(
+            loader.table_path(country, "articles"),
+            compression    = "zstd",
+            index          = False,
+            row_group_size = ARTICLES_ROW_GROUP
+        )
+        write_partitioned(
+            article_pillars,
+            loader.table_path(country, "article_pillars"),
+            loader.PARTITION_KEYS
+        )
+
+    aggregates.write_classification(country, classification)
+
+    # Inverted index and filter bitmaps for the Search Engine tab
+    search_index.write_index(country, search_index.build_index(articles, article_pillars))
+    bitmaps.write_bitmaps(country, bitmaps.build_bitmaps(article_pillars))
+
+    # Sorted date index for the publishing period filters
+    date_index.write_date_index(country, date_index.build_date_index(articles, article_pillars))
+
+    # Term-document matrices for the Frequency Analysis tab
+    frequencies.write_matrices(country, frequencies.build_matrices(articles))
+
+    # The manifest goes last, as it holds the checksums of every other file
+    catalog.write_manifest(country, catalog.build_manifest(country, articles, article_pillars))
+
+    return articles, article_pillars
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Builds the data store used by the dashboard.")
+    parser.add_argument(
+        "countries",
+        nargs = "*",
+        help  = "Countries to ingest. All countries with a master file are ingested by default."
+    )
+    parser.add_argument(
+        "--format",
+        choices = ["parquet", "arrow"],
+        default = "parquet",
+        help    = "Format of the data tables. Arrow IPC files are memory-mapped by the loader."
+    )
+    parser.add_argument(
+        "--compression",
+        choices = ["lz4"],
+        default = None,
+        help    = "Compression of the Arrow IPC files. Leave it out to keep them zero-copy."
+    )
+    args = parser.parse_args()
+
+    for country in args.countries or available_countries():
+        start = time.perf_counter()
+        articles, article_pillars = ingest_country(country, args.format, args.compression)
+        print(
+            f"{country}: {len(articles):,} articles, {len(article_pillars):,} pillar rows "
+            f"({time.perf_counter() - start:.1f}s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,459 @@
+"""
+Project:        EU ROL Tracker Dashboard
+Module Name:    Data Loader
+Author:         Carlos Alberto Toruño Paniagua
+Creation Date:  October 17th, 2026
+Description:    This module contains the shared data loader used by every page of the EU ROL Tracker Dashboard.
+                Country datasets are read from the data store built by tools/ingest.py once per server
+                process, column by column, and kept in a memory-bounded LRU cache that is shared across all
+                user sessions.
+"""
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Copy-on-write guarantees that pages can add or overwrite columns in the frames they receive without
+# ever touching the shared copy stored in the cache
+pd.set_option("mode.copy_on_write", True)
+
+DATA_PATH  = "data/news-data"
+STORE_PATH = "data/store"
+
+# Memory budget for the shared cache (in megabytes). It can be adjusted per deployment through the
+# ROLTRACKER_CACHE_MB environment variable. The workers of the "All EU" search split another budget of the
+# same size between them (see tools/search.py), so the server can use up to twice this amount
+CACHE_BUDGET_MB = int(os.environ.get("ROLTRACKER_CACHE_MB", 2048))
+
+
+class LRUCache:
+
+    def __init__(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self.used_bytes   = 0
+        self.hits         = 0
+        self.misses       = 0
+        self._entries     = OrderedDict()
+        self._lock        = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def put(self, key, value, nbytes):
+        with self._lock:
+            if key in self._entries:
+                self.used_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, nbytes)
+            self.used_bytes += nbytes
+
+            # Evicting the least recently used entries until we are back under budget. The entry we just
+            # inserted is always kept, even if it is larger than the budget on its own
+            while self.used_bytes > self.budget_bytes and len(self._entries) > 1:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self.used_bytes -= evicted_bytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.used_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries"    : len(self._entries),
+                "used_bytes" : self.used_bytes,
+                "hits"       : self.hits,
+                "misses"     : self.misses
+            }
+
+
+_cache = LRUCache(CACHE_BUDGET_MB * 1024**2)
+
+# One lock per key being read, so that two sessions asking for the same country at once only read the file
+# once. A lock is dropped as soon as its key is read, so only the keys being read at the moment hold one
+_key_locks = {}
+_key_locks_guard = threading.Lock()
+
+
+@contextmanager
+def _lock_for(key):
+    with _key_locks_guard:
+        lock = _key_locks.setdefault(key, threading.Lock())
+    with lock:
+        try:
+            yield
+        finally:
+            # Sessions already waiting on this lock find the value in the cache once they get it
+            with _key_locks_guard:
+                if _key_locks.get(key) is lock:
+                    del _key_locks[key]
+
+
+def master_path(country):
+    return f"{DATA_PATH}/{country}_master.parquet.gzip"
+
+
+def store_path(country):
+    return f"{STORE_PATH}/{country}"
+
+
+def table_path(country, table, fmt = "parquet"):
+    return f"{store_path(country)}/{table}.{fmt}"
+
+
+def table_format(country, table):
+    # Tables converted to Arrow IPC files are memory-mapped instead of decompressed, so they are preferred
+    if os.path.exists(table_path(country, table, "arrow")):
+        return "arrow"
+    return "parquet"
+
+
+# Labels of the pillars and of the impact scores assigned by the model
+PILLARS = ["Pillar 1", "Pillar 2", "Pillar 3", "Pillar 4", "Pillar 5", "Pillar 6", "Pillar 7", "Pillar 8"]
+IMPACT_SCORES = {
+    0 : "Undefined",
+    1 : "Very Negative",
+    2 : "Negative",
+    3 : "Neutral",
+    4 : "Positive",
+    5 : "Very Positive",
+}
+
+# Columns stored once per article. The "week_start" column is derived during the ingest step and the
+# "pillars" column packs the pillar_1 to pillar_8 flags into a uint8 bitmask (see tools/pillar_flags.py)
+ARTICLE_COLUMNS = [
+    "id",
+    "link",
+    "domain_url",
+    "published_date",
+    "week_start",
+    "title_trans",
+    "description_trans",
+    "content_trans",
+    "cleaned_text",
+    "entities",
+    "pillars"
+]
+
+# Columns stored once per article and associated pillar. The "article" column holds the position of the
+# article in the articles table and "impact_score_text" is derived during the ingest step. The summary is
+# written by the model for each pillar, so it lives here
+PILLAR_COLUMNS = [
+    "article",
+    "associated_pillar",
+    "impact_score",
+    "impact_score_text",
+    "summary"
+]
+
+# The article_pillars table is sorted by these columns and written with one row group per combination,
+# so filters on them only read the matching slice of the file
+PARTITION_KEYS = ["associated_pillar", "impact_score"]
+
+# Heavy text columns. They are never read unless a page explicitly asks for them, so pages working
+# only with dates, scores and pillars never decompress the article bodies
+TEXT_COLUMNS = [
+    "title_trans",
+    "description_trans",
+    "content_trans",
+    "summary",
+    "cleaned_text",
+    "entities"
+]
+
+
+def check_store(country, path):
+    if not os.path.exists(path):
+        raise FileNotFoundError(
+            f"The data store for {country} has not been built. Please run: python -m tools.ingest {country}"
+        )
+
+
+def nbytes(value):
+    """
+    Returns the memory charged to an object in the cache. Python containers count their items (and keys),
+    and objects built by other modules, e.g. the search index, report their own size through nbytes.
+    """
+
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep = True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep = True))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(nbytes(key) + nbytes(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(nbytes(item) for item in value)
+    if hasattr(value, "indptr"):
+        # Sparse matrices
+        return int(value.data.nbytes + value.indices.nbytes + value.indptr.nbytes)
+    if isinstance(value, np.ndarray) and value.dtype == object:
+        # Arrays of Python objects (e.g. a vocabulary) only hold pointers to them
+        return int(value.nbytes) + sum(sys.getsizeof(item) for item in value)
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    return sys.getsizeof(value)
+
+
+def load_artifact(key, read):
+    """
+    Returns an object derived from the data store (aggregates, indexes...), reading it only once. These
+    objects share the memory budget of the cache with the data tables.
+    """
+
+    value = _cache.get(key)
+    if value is None:
+        with _lock_for(key):
+            value = _cache.get(key)
+            if value is None:
+                value = read()
+                _cache.put(key, value, nbytes(value))
+    return value
+
+
+def _arrow_types(arrow_type):
+    # Text columns are kept as Arrow buffers (backed by the memory map) instead of Python strings
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return pd.ArrowDtype(arrow_type)
+    return None
+
+
+def _read_columns(country, table, columns):
+    if table_format(country, table) == "arrow":
+
+        # Nothing is copied here: the table points to the memory-mapped file, whose pages are shared through
+        # the page cache by every Streamlit process running on the host
+        source = pa.memory_map(table_path(country, table, "arrow"), "r")
+        data   = pa.ipc.open_file(source).read_all().select(columns).to_pandas(types_mapper = _arrow_types)
+    else:
+        path = table_path(country, table)
+        check_store(country, path)
+        data = pd.read_parquet(path, columns = columns)
+
+    return {col: data[col] for col in columns}
+
+
+def load_table(country, table, columns):
+    """
+    Returns a DataFrame with the requested columns of a table of the data store. Every column is cached
+    on its own, so a column is only read from disk the first time any page touches it.
+    """
+
+    series  = {}
+    missing = []
+    for col in columns:
+        cached = _cache.get(("column", country, table, col))
+        if cached is None:
+            missing.append(col)
+        else:
+            series[col] = cached
+
+    if missing:
+        with _lock_for(("table", country, table)):
+
+            # Another session might have loaded some of the columns while we were waiting for the lock
+            still_missing = []
+            for col in missing:
+                cached = _cache.get(("column", country, table, col))
+                if cached is None:
+                    still_missing.append(col)
+                else:
+                    series[col] = cached
+
+            if still_missing:
+                for col, values in _read_columns(country, table, still_missing).items():
+                    _cache.put(("column", country, table, col), values, nbytes(values))
+                    series[col] = values
+
+    # Pages receive a new frame built on top of the cached columns: assembling it is cheap and, thanks to
+    # copy-on-write, any modification they make stays local to their own session
+    return pd.DataFrame({col: series[col] for col in columns})
+
+
+def load_articles(country, columns):
+    return load_table(country, "articles", columns)
+
+
+def _row_groups(country, table):
+    """
+    Returns the first row, the number of rows and the min/max statistics of the partition keys of every
+    row group of a table.
+    """
+
+    def read():
+        path = table_path(country, table)
+        check_store(country, path)
+        metadata = pq.ParquetFile(path).metadata
+        names    = metadata.schema.to_arrow_schema().names
+        groups   = []
+        start    = 0
+        for i in range(metadata.num_row_groups):
+            row_group = metadata.row_group(i)
+            stats = {}
+            for key in PARTITION_KEYS:
+                column_stats = row_group.column(names.index(key)).statistics
+                stats[key]   = (column_stats.min, column_stats.max)
+            groups.append((start, row_group.num_rows, stats))
+            start += row_group.num_rows
+        return groups
+
+    return load_artifact(("row_groups", country, table), read)
+
+
+def _read_filtered(country, table, columns, filters):
+    """
+    Reads only the row groups whose statistics overlap the filters. Rows keep their position in the full
+    table as index, so they can be matched with the rest of the data.
+    """
+
+    selected  = []
+    positions = []
+    for i, (start, nrows, stats) in enumerate(_row_groups(country, table)):
+        if all(any(stats[key][0] <= value <= stats[key][1] for value in values) for key, values in filters.items()):
+            selected.append(i)
+            positions.append(np.arange(start, start + nrows))
+
+    parquet = pq.ParquetFile(table_path(country, table))
+    data = parquet.read_row_groups(selected, columns = columns + list(filters)).to_pandas()
+    data.index = np.concatenate(positions) if positions else np.array([], dtype = np.int64)
+    return data
+
+
+def load_pillars(country, columns, pillars = None, sentiments = None, rows = None):
+    """
+    Returns the requested columns of the article_pillars table. Filters on pillars and sentiments (impact
+    score labels) are pushed down to the reader, so only the matching slice of the file is read, unless
+    the columns are already cached in full. Rows can also be restricted to a sorted array of positions,
+    e.g. the rows of a publishing period (see tools/date_index.py).
+    """
+
+    filters = {}
+    if pillars is not None:
+        filters["associated_pillar"] = list(pillars)
+    if sentiments is not None:
+        scores = {label: score for score, label in IMPACT_SCORES.items()}
+        filters["impact_score"] = [scores[label] for label in sentiments]
+
+    if not filters and rows is None:
+        return load_table(country, "article_pillars", columns)
+
+    # Memory-mapped tables and fully cached columns are filtered in memory, as there is nothing to read.
+    # Positions are taken first, so the filters only look at the rows that were asked for
+    needed = list(dict.fromkeys(columns + list(filters)))
+    cached = all(_cache.get(("column", country, "article_pillars", col)) is not None for col in needed)
+    if rows is not None or cached or table_format(country, "article_pillars") == "arrow":
+        data = load_table(country, "article_pillars", needed)
+        if rows is not None:
+            data = data.iloc[rows]
+    else:
+        key  = ("slice", country, "article_pillars", tuple(needed), tuple((k, tuple(v)) for k, v in filters.items()))
+        data = load_artifact(key, lambda: _read_filtered(country, "article_pillars", needed, filters))
+
+    mask = np.ones(len(data), dtype = bool)
+    for col, values in filters.items():
+        mask &= data[col].isin(values).to_numpy()
+    return data.loc[mask, columns]
+
+
+def load_country(country, columns, pillars = None, sentiments = None, rows = None):
+    """
+    Returns the data for a country in long format, with one row per article and associated pillar. Only
+    use it when pillar-level and article-level columns are needed together. Filters and rows work as in
+    load_pillars().
+    """
+
+    pillar_cols  = ["article"] + [col for col in columns if col in PILLAR_COLUMNS and col != "article"]
+    article_cols = [col for col in columns if col in ARTICLE_COLUMNS]
+
+    data = load_pillars(country, pillar_cols, pillars, sentiments, rows)
+    if article_cols:
+        articles = load_articles(country, article_cols).take(data["article"])
+        for col in article_cols:
+            data[col] = articles[col].array
+
+    return data
+
+
+def _read_rows(country, table, columns, positions):
+    """
+    Reads some rows of a table, given by their positions (in any order), without caching anything. Columns
+    already cached in full are taken from the cache instead. Rows keep their position as index.
+    """
+
+    positions = np.asarray(positions, dtype = np.int64)
+    series    = {}
+    missing   = []
+    for col in columns:
+        cached = _cache.get(("column", country, table, col))
+        if cached is None:
+            missing.append(col)
+        else:
+            series[col] = cached.take(positions)
+
+    if missing and table_format(country, table) == "arrow":
+        # Only the requested rows are copied out of the memory-mapped file
+        source = pa.memory_map(table_path(country, table, "arrow"), "r")
+        data   = pa.ipc.open_file(source).read_all().select(missing).take(positions)
+        data   = data.to_pandas(types_mapper = _arrow_types)
+    elif missing:
+        # Only the row groups holding the requested rows are read
+        path = table_path(country, table)
+        check_store(country, path)
+        parquet  = pq.ParquetFile(path)
+        sizes    = np.array([parquet.metadata.row_group(i).num_rows for i in range(parquet.metadata.num_row_groups)])
+        starts   = np.cumsum(sizes) - sizes
+        groups   = np.searchsorted(starts, positions, side = "right") - 1
+        selected = np.unique(groups)
+
+        # First row of every selected row group once they are read together
+        offsets = np.zeros(len(sizes), dtype = np.int64)
+        offsets[selected] = np.cumsum(sizes[selected]) - sizes[selected]
+        data = parquet.read_row_groups(selected.tolist(), columns = missing)
+        data = data.take(positions - starts[groups] + offsets[groups]).to_pandas()
+
+    for col in missing:
+        series[col] = data[col]
+
+    return pd.DataFrame({col: series[col].array for col in columns}, index = positions)
+
+
+def load_rows(country, columns, rows):
+    """
+    Returns the data of a few rows of the article_pillars table (given by their position), along with the
+    columns of their articles, e.g. the results displayed in a page of the Search Engine. Unlike
+    load_country(), only those rows are read and nothing is added to the cache.
+    """
+
+    pillar_cols  = ["article"] + [col for col in columns if col in PILLAR_COLUMNS and col != "article"]
+    article_cols = [col for col in columns if col in ARTICLE_COLUMNS]
+
+    data = _read_rows(country, "article_pillars", pillar_cols, rows)
+    if article_cols:
+        articles = _read_rows(country, "articles", article_cols, data["article"])
+        for col in article_cols:
+            data[col] = articles[col].array
+
+    return data
+
+
+def load_text(country, column, articles):
+    """
+    Returns the values of a text column for a subset of articles (given by their position in the articles
+    table), e.g. the full content of the articles that matched a search. Only those articles are read.
+    """
+
+    if column not in TEXT_COLUMNS or column not in ARTICLE_COLUMNS:
+        raise ValueError(f"{column} is not an article text column")
+    return _read_rows(country, "articles", [column], articles)[column]
@@ -0,0 +1,61 @@
+"""
+Project:        EU ROL Tracker Dashboard
+Module Name:    Pillar Flags
+Author:         Carlos Alberto Toruño Paniagua
+Creation Date:  October 17th, 2026
+Description:    This module contains the helpers to work with the pillar bitmask stored in the articles table.
+                The eight pillar_1 to pillar_8 flags of an article are packed into a single uint8 value, where
+                bit 0 stands for Pillar 1 and bit 7 for Pillar 8.
+"""
+
+import numpy as np
+import pandas as pd
+
+FLAG_COLUMNS = ["pillar_1", "pillar_2", "pillar_3", "pillar_4", "pillar_5", "pillar_6", "pillar_7", "pillar_8"]
+
+# Bit of every pillar flag, as a (1, 8) row so it broadcasts against a column of masks
+_BITS = (np.uint8(1) << np.arange(8, dtype = np.uint8)).reshape(1, 8)
+
+# Flags of every possible mask value, as a (256, 8) table
+_FLAGS_BY_MASK = ((np.arange(256, dtype = np.uint8).reshape(256, 1) & _BITS) > 0).astype(np.int64)
+
+
+def pack(flags):
+    """
+    Packs a DataFrame with the pillar_1 to pillar_8 flag columns into a uint8 bitmask.
+    """
+
+    values = (flags[FLAG_COLUMNS].to_numpy() > 0).astype(np.uint8)
+    return (values * _BITS).sum(axis = 1).astype(np.uint8)
+
+
+def unpack(masks):
+    """
+    Expands a bitmask into a DataFrame with the pillar_1 to pillar_8 flag columns.
+    """
+
+    values = np.asarray(masks, dtype = np.uint8)
+    index  = masks.index if isinstance(masks, pd.Series) else None
+    return pd.DataFrame(_FLAGS_BY_MASK[values], columns = FLAG_COLUMNS, index = index)
+
+
+def has_pillar(masks, pillar):
+    """
+    Returns a boolean array telling which articles are associated to a pillar (1 to 8).
+    """
+
+    return (np.asarray(masks, dtype = np.uint8) & np.uint8(1 << (pillar - 1))) > 0
+
+
+def cooccurrence(masks, counts = None):
+    """
+    Returns the 8x8 matrix with the number of articles shared by every pair of pillars. Instead of
+    multiplying the flags of every article, the masks are counted (there are only 256 possible values)
+    and the matrix is built from those counts. When given, counts holds the number of articles behind
+    every mask, e.g. for masks that were already counted per day.
+    """
+
+    weights = None if counts is None else np.asarray(counts, dtype = np.int64)
+    counts  = np.bincount(np.asarray(masks, dtype = np.uint8), weights = weights, minlength = 256).astype(np.int64)
+    matrix = _FLAGS_BY_MASK.T @ (_FLAGS_BY_MASK * counts.reshape(256, 1))
+    return pd.DataFrame(matrix, index = FLAG_COLUMNS, columns = FLAG_COLUMNS)
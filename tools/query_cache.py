@@ -0,0 +1,73 @@
+"""
+Project:        EU ROL Tracker Dashboard
+Module Name:    Query Cache
+Author:         Carlos Alberto Toruño Paniagua
+Creation Date:  October 17th, 2026
+Description:    This module contains the cache of search results used by the Search Engine tab. Every rerun of
+                the page used to search the data again, even when the query had not changed. The rows that
+                matched a query are now kept in an LRU cache shared by all user sessions, keyed by country,
+                filters, search mode, normalized query and version of the data store.
+"""
+
+import os
+
+from tools import catalog
+from tools import loader
+from tools import search_index
+
+# Memory budget for the cached results (in megabytes). It can be adjusted per deployment through the
+# ROLTRACKER_QUERY_CACHE_MB environment variable. As with the data cache, the workers of the "All EU"
+# search split another budget of the same size between them
+QUERY_CACHE_MB = int(os.environ.get("ROLTRACKER_QUERY_CACHE_MB", 64))
+
+# Operators of the search syntax, which are case sensitive
+OPERATORS = ["AND", "OR", "NOT", "(", ")"]
+
+_cache = loader.LRUCache(QUERY_CACHE_MB * 1024**2)
+
+
+def normalize_query(query, regex = False):
+    """
+    Returns a canonical form of a query, so that queries differing only in spacing or case share the same
+    results. Regular expressions are kept as they are, since both could change their meaning.
+    """
+
+    if regex:
+        return query
+
+    tokens = []
+    for token in search_index.QUERY_RE.findall(query):
+        if token in OPERATORS or search_index.NEAR_RE.fullmatch(token):
+            tokens.append(token)
+        else:
+            tokens.append(token.lower())
+    return " ".join(tokens)
+
+
+def get_matches(country, filters, query, mode, search):
+    """
+    Returns the matches of a query, calling search() only if they are not cached. Filters must be hashable,
+    the mode is either "regex" or the tuple of index fields searched, and search() must return the sorted
+    matching rows along with the terms used to rank them.
+    """
+
+    key = (country, filters, mode, normalize_query(query, mode == "regex"), catalog.version(country))
+
+    matches = _cache.get(key)
+    if matches is None:
+        rows, terms = search()
+
+        # Cached rows are shared across sessions, so they are made read-only
+        rows.flags.writeable = False
+        matches = (rows, tuple(terms))
+        _cache.put(key, matches, rows.nbytes)
+    return matches
+
+
+def stats():
+    """
+    Returns the number of cached queries, the memory they use, and the number of hits and misses of the
+    cache since the server started.
+    """
+
+    return _cache.stats()
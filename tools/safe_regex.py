@@ -0,0 +1,108 @@
+"""
+Project:        EU ROL Tracker Dashboard
+Module Name:    Safe Regular Expressions
+Author:         Carlos Alberto Toruño Paniagua
+Creation Date:  October 17th, 2026
+Description:    This module contains the regular expression mode of the Search Engine tab. User patterns used
+                to be pasted into Python lookaheads, so a pathological pattern could backtrack for minutes
+                and pin a server core. Patterns are now run with the RE2 engine bundled in PyArrow, which
+                works in linear time. Patterns that RE2 does not support (lookarounds, backreferences) are
+                run with Python's engine in a separate process, which is killed once the time budget of the
+                query runs out.
+"""
+
+import os
+import pickle
+import re
+import subprocess
+import sys
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Time budget (in seconds) of a query that can not be run with RE2. It can be adjusted per deployment
+# through the ROLTRACKER_REGEX_TIMEOUT environment variable
+REGEX_TIMEOUT = float(os.environ.get("ROLTRACKER_REGEX_TIMEOUT", 2))
+
+# Python's engine can not be interrupted, so it runs in its own process. It is an isolated interpreter that
+# only imports the re module, started when a query needs it, so it never shares any state with the server
+# process nor runs its entry script again. Texts are sent as strings (or None) and every match as one byte
+_WORKER = """
+import pickle, re, sys
+texts, patterns = pickle.load(sys.stdin.buffer)
+compiled = [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+sys.stdout.buffer.write(bytes(text is not None and all(regex.search(text) for regex in compiled) for text in texts))
+"""
+
+
+def keyword_patterns(keywords):
+    """
+    Splits the keywords typed in the Search Engine into the patterns that must all match. Just like
+    before, " OR " joins two keywords into a single alternative.
+    """
+
+    keywords = re.sub(" OR ", "|", keywords)
+    return keywords.split()
+
+
+def linear_match(texts, patterns):
+    """
+    Returns which texts match every pattern, using RE2. Raises pyarrow.ArrowInvalid if a pattern is not
+    supported by RE2.
+    """
+
+    # Memory-mapped summaries are already Arrow strings, so they are not copied
+    array = pa.array(texts)
+    if not pa.types.is_string(array.type) and not pa.types.is_large_string(array.type):
+        array = array.cast(pa.string())
+
+    matched = np.ones(len(array), dtype = bool)
+    for pattern in patterns:
+        found = pc.match_substring_regex(array, pattern, ignore_case = True).fill_null(False)
+        matched &= found.to_numpy(zero_copy_only = False)
+    return matched
+
+
+def bounded_match(texts, patterns, timeout = REGEX_TIMEOUT):
+    """
+    Returns which texts match every pattern, using Python's engine in a worker process. Raises
+    TimeoutError if the worker does not finish within the time budget.
+    """
+
+    payload = pickle.dumps(([text if isinstance(text, str) else None for text in texts], patterns))
+    worker  = subprocess.Popen(
+        [sys.executable, "-I", "-c", _WORKER],
+        stdin  = subprocess.PIPE,
+        stdout = subprocess.PIPE
+    )
+    try:
+        output, _ = worker.communicate(payload, timeout = timeout)
+    except subprocess.TimeoutExpired:
+        raise TimeoutError(f"The regular expression did not finish within {timeout:g} seconds") from None
+    finally:
+        if worker.poll() is None:
+            worker.kill()
+            worker.communicate()
+    if worker.returncode != 0:
+        raise RuntimeError("The regular expression worker stopped unexpectedly")
+    return np.frombuffer(output, dtype = bool).copy()
+
+
+def search(texts, keywords, timeout = REGEX_TIMEOUT):
+    """
+    Returns a boolean array telling which texts match the keywords typed in the regular expression mode of
+    the Search Engine. Raises re.error if a pattern is not valid and TimeoutError if a pattern not supported
+    by RE2 runs out of time.
+    """
+
+    patterns = keyword_patterns(keywords)
+
+    # Invalid patterns are reported right away, instead of from within the worker process
+    for pattern in patterns:
+        re.compile(pattern)
+
+    try:
+        return linear_match(texts, patterns)
+    except pa.ArrowInvalid:
+        return bounded_match(texts, patterns, timeout)
@@ -0,0 +1,182 @@
+"""
+Project:        EU ROL Tracker Dashboard
+Module Name:    Search
+Author:         Carlos Alberto Toruño Paniagua
+Creation Date:  October 17th, 2026
+Description:    This module contains the searches run by the Search Engine tab, for a single country or for
+                all of them at once. Every country is a shard with its own data store and search index. In
+                the "All EU" mode, the shards are searched in parallel by a pool of worker processes, each
+                one returns its best results, and those are merged into a single ranked stream.
+"""
+
+import heapq
+import itertools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from tools import bitmaps
+from tools import date_index
+from tools import loader
+from tools import query_cache
+from tools import safe_regex
+from tools import search_index
+
+# Number of worker processes searching the countries in parallel. It can be adjusted per deployment
+# through the ROLTRACKER_SHARD_WORKERS environment variable. The workers split the budgets of the data cache
+# and of the query cache between them, on top of the caches of the server process, so the ceiling of the
+# server is about twice ROLTRACKER_CACHE_MB plus twice ROLTRACKER_QUERY_CACHE_MB
+SHARD_WORKERS = int(os.environ.get("ROLTRACKER_SHARD_WORKERS", os.cpu_count() or 1))
+
+_pool      = None
+_pool_lock = threading.Lock()
+
+
+def search_mode(regex_mode, full_content):
+    """
+    Returns "regex" for regular expression searches, or the index fields searched by keyword searches.
+    """
+
+    if regex_mode:
+        return "regex"
+    return ("summary", "content") if full_content else ("summary",)
+
+
+def _as_key(values):
+    return None if values is None else tuple(values)
+
+
+def find_matches(country, keywords, pillars, sentiments, dates, mode):
+    """
+    Returns the sorted rows of the article_pillars table of a country that match a search, along with the
+    terms used to rank them. Filters left as None are not applied (see tools/bitmaps.py) and dates is a
+    (start, end) pair of ISO days. Results are cached (see tools/query_cache.py).
+    """
+
+    def search():
+        mask = bitmaps.select(country, pillars, sentiments)
+
+        # Sorted rows of the publishing period, found by binary search in the date index
+        period = None if dates is None else date_index.rows_between(country, *dates)
+
+        if mode == "regex":
+            data = loader.load_pillars(country, ["summary"], pillars = pillars, sentiments = sentiments)
+            data = data[bitmaps.contains(mask, data.index)]
+            if period is not None:
+                data = data.loc[np.intersect1d(data.index.to_numpy(), period, assume_unique = True)]
+            matched = safe_regex.search(data["summary"], keywords)
+            return data.index[matched].to_numpy(), []
+
+        # Rows found in the inverted index are checked against the bitmap of the filters and the period
+        matches, terms = search_index.load_index(country).parse(keywords, list(mode))
+        matches = matches[bitmaps.contains(mask, matches)]
+        if period is not None:
+            matches = np.intersect1d(matches, period, assume_unique = True)
+        return matches, terms
+
+    filters = (_as_key(pillars), _as_key(sentiments), _as_key(dates))
+    return query_cache.get_matches(country, filters, keywords, mode, search)
+
+
+def display_rows(country, rows, terms, mode, columns):
+    """
+    Returns the columns of some rows displayed by the Search Engine tab, reading only those rows. Keyword
+    searches replace the summary with a snippet where the matched words are highlighted and, when the
+    content was searched, add a snippet of it. Snippets are cut using the positions stored in the index.
+    """
+
+    data = loader.load_rows(country, columns, rows)
+    if mode == "regex":
+        return data
+
+    country_index   = search_index.load_index(country)
+    data["summary"] = [
+        country_index.snippet("summary", row, terms, text) for row, text in zip(data.index, data["summary"])
+    ]
+    if "content" in mode:
+        bodies = loader.load_text(country, "content_trans", data["article"])
+        data["content"] = [
+            country_index.snippet("content", article, terms, body)
+            for article, body in zip(data["article"], bodies)
+        ]
+    return data
+
+
+def search_country(country, keywords, pillars, sentiments, dates, mode, k, relevance, columns = None):
+    """
+    Searches a country and returns the number of matches along with the first k of them (and their BM25
+    scores when sorting by relevance), and the terms of the query, to highlight them. With columns, the
+    display fields of those k rows (see display_rows()) are returned as well, otherwise None.
+    """
+
+    matches, terms = find_matches(country, keywords, pillars, sentiments, dates, mode)
+    if relevance and mode != "regex":
+        rows, scores = search_index.load_index(country).top_k(matches, terms, k, list(mode), return_scores = True)
+    else:
+        rows, scores = matches[:k], np.zeros(min(k, len(matches)))
+
+    display = None if columns is None else display_rows(country, rows, terms, mode, columns)
+    return country, len(matches), rows, scores, terms, display
+
+
+def _init_worker(budget_bytes, query_budget_bytes):
+    # The memory budgets of the caches are split between the workers
+    loader._cache.budget_bytes      = budget_bytes
+    query_cache._cache.budget_bytes = query_budget_bytes
+
+
+def _shard_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers = SHARD_WORKERS,
+                mp_context  = multiprocessing.get_context("forkserver"),
+                initializer = _init_worker,
+                initargs    = (
+                    loader.CACHE_BUDGET_MB * 1024**2 // SHARD_WORKERS,
+                    query_cache.QUERY_CACHE_MB * 1024**2 // SHARD_WORKERS
+                )
+            )
+        return _pool
+
+
+def search_countries(countries, keywords, pillars, sentiments, dates, mode, k, relevance, columns = None):
+    """
+    Searches several countries in parallel. Yields the result of search_country() for every country as soon
+    as its search finishes. The display fields are read by the workers too, so the server process never
+    loads the data of the countries searched.
+    """
+
+    pool    = _shard_pool()
+    futures = [
+        pool.submit(search_country, country, keywords, pillars, sentiments, dates, mode, k, relevance, columns)
+        for country in countries
+    ]
+    try:
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def merge_shards(shards, countries, k, relevance):
+    """
+    Merges the results of several countries into their first k (country, row) pairs. When sorting by
+    relevance, the results are merged by BM25 score, otherwise countries are taken in order.
+    """
+
+    order   = {country: position for position, country in enumerate(countries)}
+    shards  = sorted(shards, key = lambda shard: order[shard[0]])
+    streams = [
+        [(-score, order[country], int(row)) for row, score in zip(rows, scores)]
+        for country, _, rows, scores, *_ in shards
+    ]
+
+    # Every stream is already sorted, so heapq.merge only keeps one pending result per country in its heap
+    merged = heapq.merge(*streams) if relevance else itertools.chain(*streams)
+    return [(countries[position], row) for _, position, row in itertools.islice(merged, k)]
@@ -0,0 +1,510 @@
+"""
+Project:        EU ROL Tracker Dashboard
+Module Name:    Search Index
+Author:         Carlos Alberto Toruño Paniagua
+Creation Date:  October 17th, 2026
+Description:    This module contains the inverted index used by the Search Engine tab. The index is built by
+                tools/ingest.py and maps every term to the sorted list of rows of the article_pillars table
+                where it appears, along with the positions of the term within each of them. Searches are
+                answered by intersecting and merging posting and position lists instead of scanning every
+                summary with a regular expression.
+
+                Two fields are indexed:
+                - summary: the summary written by the model for every article and pillar (one per row)
+                - content: the full content of the article, shared by all the rows of the same article
+
+                Queries support:
+                - european funds           both terms (AND)
+                - european OR funds        any of the terms
+                - european NOT funds       european but not funds (also: european -funds)
+                - (court OR judge) bribe   parentheses to group terms
+                - judic*                   every term starting with "judic"
+                - "european funds"         exact phrase
+                - court NEAR/5 bribe       both terms, at most 5 words apart (in any order)
+
+                Matches can be ranked with BM25, using the document lengths stored in the index and the term
+                statistics given by the posting lists (document frequencies) and position lists (term
+                frequencies). The characters spanned by every token are also stored, so the snippets of the
+                results are cut and highlighted straight from the position lists.
+"""
+
+import bisect
+import html
+import os
+import re
+
+import numpy as np
+
+from tools import loader
+
+FIELDS = ["summary", "content"]
+
+TOKEN_RE = re.compile(r"\w+")
+QUERY_RE = re.compile(r'-?"[^"]*"?|\(|\)|-?[^\s()"]+')
+NEAR_RE  = re.compile(r"NEAR/(\d+)")
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B  = 0.75
+
+# Number of words shown in the snippets of the results
+SNIPPET_WORDS = 40
+
+
+def tokenize(text):
+    if not isinstance(text, str):
+        return []
+    return TOKEN_RE.findall(text.lower())
+
+
+def tokenize_spans(text):
+    """
+    Returns the tokens of a text (just like tokenize()) along with the position of the first and after the
+    last character of every token in the original text.
+    """
+
+    if not isinstance(text, str):
+        return [], [], []
+    lowered = text.lower()
+    matches = list(TOKEN_RE.finditer(lowered))
+    tokens  = [match.group() for match in matches]
+    starts  = np.array([match.start() for match in matches], dtype = np.int64)
+    ends    = np.array([match.end() for match in matches], dtype = np.int64)
+
+    # A few characters grow when lowered (e.g. "İ"), which shifts the positions in the lowered text
+    if len(lowered) != len(text):
+        shifted = np.cumsum([len(char.lower()) for char in text])
+        starts  = np.searchsorted(shifted, starts, side = "right")
+        ends    = np.searchsorted(shifted, ends - 1, side = "right") + 1
+    return tokens, starts, ends
+
+
+def index_path(country, field):
+    return f"{loader.store_path(country)}/index/{field}"
+
+
+def _ranges(starts, lengths):
+    """
+    Returns the concatenation of the ranges [start, start + length), without looping over them.
+    """
+
+    within = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return np.repeat(starts, lengths) + within
+
+
+def build_field(texts):
+    """
+    Builds the positional posting lists of a field. Returns the sorted vocabulary, the offsets of the
+    posting list of every term, the concatenated posting lists, the offsets and values of the positions of
+    every posting, the number of tokens of every document, and the characters spanned by every token of
+    every document (in document order), used to build the snippets.
+    """
+
+    vocabulary = {}
+    term_ids   = []
+    lengths    = []
+    spans      = []
+    for text in texts:
+        tokens, starts, ends = tokenize_spans(text)
+        term_ids.extend(vocabulary.setdefault(token, len(vocabulary)) for token in tokens)
+        lengths.append(len(tokens))
+        spans.append(np.stack([starts, ends], axis = 1))
+
+    # Renumbering the terms in alphabetical order, so prefix queries become a range of terms
+    terms = np.array(sorted(vocabulary), dtype = object)
+    rank  = np.empty(len(vocabulary), dtype = np.int64)
+    rank[[vocabulary[term] for term in terms]] = np.arange(len(terms))
+
+    lengths   = np.asarray(lengths, dtype = np.int64)
+    term_ids  = rank[np.asarray(term_ids, dtype = np.int64)]
+    doc_ids   = np.repeat(np.arange(len(lengths), dtype = np.int32), lengths)
+    positions = _ranges(np.zeros(len(lengths), dtype = np.int64), lengths).astype(np.int32)
+
+    # Tokens are already sorted by document and position, so a stable sort by term is enough
+    order     = np.argsort(term_ids, kind = "stable")
+    term_ids  = term_ids[order]
+    doc_ids   = doc_ids[order]
+    positions = positions[order]
+
+    # Every posting is a run of tokens with the same term and document
+    first = np.ones(len(term_ids), dtype = bool)
+    first[1:] = (term_ids[1:] != term_ids[:-1]) | (doc_ids[1:] != doc_ids[:-1])
+    starts = np.flatnonzero(first)
+
+    offsets = np.zeros(len(terms) + 1, dtype = np.int64)
+    offsets[1:] = np.cumsum(np.bincount(term_ids[starts], minlength = len(terms)))
+
+    return {
+        "terms"            : terms,
+        "offsets"          : offsets,
+        "postings"         : doc_ids[starts],
+        "position_offsets" : np.append(starts, len(term_ids)).astype(np.int64),
+        "positions"        : positions,
+        "lengths"          : lengths.astype(np.int32),
+        "spans"            : np.concatenate(spans).astype(np.int32) if spans else np.zeros((0, 2), dtype = np.int32)
+    }
+
+
+def build_index(articles, article_pillars):
+    return {
+        "summary" : build_field(article_pillars["summary"]),
+        "content" : build_field(articles["content_trans"])
+    }
+
+
+def write_index(country, index):
+    for field, data in index.items():
+        path = index_path(country, field)
+        os.makedirs(path, exist_ok = True)
+
+        # Terms are stored as a single UTF-8 blob, one term per line
+        blob = "\n".join(data["terms"]).encode("utf-8")
+        np.save(f"{path}/terms.npy", np.frombuffer(blob, dtype = np.uint8))
+        np.save(f"{path}/offsets.npy", data["offsets"])
+        np.save(f"{path}/postings.npy", data["postings"])
+        np.save(f"{path}/position_offsets.npy", data["position_offsets"])
+        np.save(f"{path}/positions.npy", data["positions"])
+        np.save(f"{path}/lengths.npy", data["lengths"])
+        np.save(f"{path}/spans.npy", data["spans"])
+
+
+class SearchIndex:
+
+    def __init__(self, fields, row_articles):
+        self.fields = fields
+        self.n_rows = len(row_articles)
+        self.row_articles = row_articles
+
+        # Rows of every article, used to translate the article-level postings of the content field
+        self.article_rows    = np.argsort(row_articles, kind = "stable").astype(np.int32)
+        self.article_offsets = np.zeros(int(row_articles.max(initial = -1)) + 2, dtype = np.int64)
+        self.article_offsets[1:] = np.cumsum(np.bincount(row_articles, minlength = len(self.article_offsets) - 1))
+
+    @property
+    def nbytes(self):
+        # Memory charged to the index in the cache: its arrays, term lists and lookups. The article of every
+        # row is the column cached by the loader, so it is not counted again
+        return loader.nbytes(self.fields) + self.article_rows.nbytes + self.article_offsets.nbytes
+
+    def _term_range(self, field, term):
+        # Range of postings of a term. Terms are sorted, so a prefix covers a contiguous range of terms
+        data = self.fields[field]
+        if term.endswith("*"):
+            start = bisect.bisect_left(data["terms"], term[:-1])
+            stop  = bisect.bisect_left(data["terms"], term[:-1] + "\U0010ffff")
+        elif term in data["lookup"]:
+            start = data["lookup"][term]
+            stop  = start + 1
+        else:
+            return 0, 0
+        return data["offsets"][start], data["offsets"][stop]
+
+    def _postings(self, field, term):
+        first, last = self._term_range(field, term)
+        postings = self.fields[field]["postings"][first:last]
+        return np.unique(postings) if term.endswith("*") else np.asarray(postings)
+
+    def _keys(self, field, term, docs):
+        """
+        Returns the sorted occurrences of a term within some documents, encoded as document << 32 | position.
+        """
+
+        data = self.fields[field]
+        first, last = self._term_range(field, term)
+        postings = np.asarray(data["postings"][first:last])
+        starts   = np.asarray(data["position_offsets"][first:last])
+        lengths  = np.asarray(data["position_offsets"][first + 1:last + 1]) - starts
+
+        keep = np.isin(postings, docs)
+        keys = np.repeat(postings[keep].astype(np.int64) << 32, lengths[keep])
+        keys = keys | data["positions"][_ranges(starts[keep], lengths[keep])]
+        return np.unique(keys) if term.endswith("*") else keys
+
+    def _phrase_keys(self, field, terms):
+        # Occurrences of the first term that are followed by the rest of the phrase
+        docs = self._postings(field, terms[0])
+        for term in terms[1:]:
+            docs = np.intersect1d(docs, self._postings(field, term), assume_unique = True)
+
+        keys = self._keys(field, terms[0], docs)
+        for shift, term in enumerate(terms[1:], start = 1):
+            keys = np.intersect1d(keys, self._keys(field, term, docs) - shift, assume_unique = True)
+        return keys
+
+    def _to_rows(self, field, docs):
+        if field != "content":
+            return docs
+
+        # Content postings point to articles, which are translated to the rows of each article
+        starts  = self.article_offsets[docs]
+        lengths = self.article_offsets[docs + 1] - starts
+        return np.sort(self.article_rows[_ranges(starts, lengths)])
+
+    def phrase_rows(self, terms, fields):
+        rows = np.array([], dtype = np.int32)
+        for field in fields:
+            if len(terms) == 1:
+                docs = self._postings(field, terms[0])
+            else:
+                docs = np.unique(self._phrase_keys(field, terms) >> 32)
+            rows = np.union1d(rows, self._to_rows(field, docs))
+        return rows
+
+    def near_rows(self, left, right, distance, fields):
+        """
+        Returns the rows where two phrases appear at most a number of words apart, in any order.
+        """
+
+        rows = np.array([], dtype = np.int32)
+        for field in fields:
+            left_keys  = self._phrase_keys(field, left)
+            right_keys = self._phrase_keys(field, right)
+
+            # A right occurrence is close enough if it starts between len(right) - 1 + distance words
+            # before and len(left) - 1 + distance words after the left one
+            found = np.searchsorted(right_keys, left_keys - (len(right) - 1 + distance))
+            close = found < len(right_keys)
+            close[close] = right_keys[found[close]] <= left_keys[close] + (len(left) - 1 + distance)
+
+            docs = np.unique(left_keys[close] >> 32)
+            rows = np.union1d(rows, self._to_rows(field, docs))
+        return rows
+
+    def _bm25(self, field, term, docs):
+        # BM25 weight of a term in some sorted documents. A prefix is scored as a single term, adding up the
+        # frequencies of every term it covers
+        data = self.fields[field]
+        first, last = self._term_range(field, term)
+        postings    = np.asarray(data["postings"][first:last])
+        frequencies = np.diff(data["position_offsets"][first:last + 1])
+
+        n_docs = len(data["lengths"])
+        df     = len(np.unique(postings)) if term.endswith("*") else len(postings)
+        idf    = np.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+
+        found = np.minimum(np.searchsorted(docs, postings), max(len(docs) - 1, 0))
+        keep  = docs[found] == postings if len(docs) else np.zeros(len(postings), dtype = bool)
+        tf    = np.bincount(found[keep], weights = frequencies[keep], minlength = len(docs))
+
+        norm = 1 - BM25_B + BM25_B * data["lengths"][docs] / data["avg_length"]
+        return idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm)
+
+    def top_k(self, rows, terms, k, fields = ("summary",), return_scores = False):
+        """
+        Returns the k rows with the highest BM25 score for some terms, from the most to the least relevant,
+        and optionally their scores. Ties keep the order of the rows.
+        """
+
+        rows   = np.asarray(rows)
+        scores = np.zeros(len(rows))
+        for field in fields:
+            if field == "content":
+                docs, back = np.unique(self.row_articles[rows], return_inverse = True)
+            else:
+                docs, back = rows, np.arange(len(rows))
+            for term in dict.fromkeys(terms):
+                scores += self._bm25(field, term, docs)[back]
+
+        # Only the best k rows are selected and sorted, never the whole set of matches. Rows tied with the
+        # k-th score are taken in their order
+        if k < len(rows):
+            threshold = np.partition(scores, len(rows) - k)[len(rows) - k]
+            above     = np.flatnonzero(scores > threshold)
+            tied      = np.flatnonzero(scores == threshold)[:k - len(above)]
+            best      = np.concatenate([above, tied])
+        else:
+            best = np.arange(len(rows))
+        best = best[np.lexsort((rows[best], -scores[best]))]
+        if return_scores:
+            return rows[best], scores[best]
+        return rows[best]
+
+    def snippet(self, field, doc, terms, text, words = SNIPPET_WORDS):
+        """
+        Returns the HTML of a snippet of a document, with the occurrences of some terms highlighted. The
+        snippet is the run of words holding the most occurrences, found from the position lists and the
+        spans of the tokens stored in the index, so the text is never scanned again.
+        """
+
+        data   = self.fields[field]
+        length = int(data["lengths"][doc])
+        if not isinstance(text, str) or length == 0:
+            return ""
+
+        hits = np.array([], dtype = np.int64)
+        for term in dict.fromkeys(terms):
+            hits = np.union1d(hits, self._keys(field, term, np.array([doc])) & 0xFFFFFFFF)
+
+        # The window starts a few words before the first occurrence of the densest run of occurrences
+        start = 0
+        if len(hits):
+            lead   = words // 4
+            counts = np.searchsorted(hits, hits + words - lead) - np.arange(len(hits))
+            start  = max(int(hits[np.argmax(counts)]) - lead, 0)
+        start = min(start, max(length - words, 0))
+        stop  = min(start + words, length)
+
+        spans  = data["spans"][data["span_offsets"][doc]:data["span_offsets"][doc + 1]]
+        first  = 0 if start == 0 else int(spans[start, 0])
+        last   = len(text) if stop == length else int(spans[stop - 1, 1])
+        pieces = ["" if start == 0 else "… "]
+        cursor = first
+        for hit in hits[(hits >= start) & (hits < stop)]:
+            begin, end = (int(value) for value in spans[hit])
+            pieces.append(html.escape(text[cursor:begin]))
+            pieces.append(f"<mark>{html.escape(text[begin:end])}</mark>")
+            cursor = end
+        pieces.append(html.escape(text[cursor:last]))
+        pieces.append("" if stop == length else " …")
+        return "".join(pieces)
+
+    def parse(self, query, fields = ("summary",)):
+        """
+        Returns the sorted rows of the article_pillars table that match a query, along with the terms that
+        the matches must contain (excluded terms left out), to rank them. An empty query matches every row.
+        """
+
+        parser = _QueryParser(QUERY_RE.findall(query), self, fields)
+        if not parser.tokens:
+            return np.arange(self.n_rows, dtype = np.int32), []
+        return parser.parse(), parser.terms
+
+    def search(self, query, fields = ("summary",)):
+        return self.parse(query, fields)[0]
+
+
+class _QueryParser:
+
+    # Recursive descent parser. Precedence goes NOT > AND > OR, and terms next to each other are joined
+    # with AND:
+    #   or_expr  := and_expr ("OR" and_expr)*
+    #   and_expr := not_expr (["AND"] not_expr)*
+    #   not_expr := ("NOT" | "-") not_expr | "(" or_expr ")" | near
+    #   near     := phrase ("NEAR/k" phrase)*
+
+    def __init__(self, tokens, index, fields):
+        self.tokens = tokens
+        self.index  = index
+        self.fields = fields
+        self.pos    = 0
+
+        # Terms found outside of a NOT, used to rank the matches
+        self.terms   = []
+        self.negated = 0
+
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _next(self):
+        token = self._peek()
+        self.pos += 1
+        return token
+
+    def parse(self):
+        rows = self._or_expr()
+        while self._peek() is not None:
+            # Unbalanced closing parentheses are ignored
+            self._next()
+            rows = np.intersect1d(rows, self._or_expr(), assume_unique = True)
+        return rows
+
+    def _or_expr(self):
+        rows = self._and_expr()
+        while self._peek() == "OR":
+            self._next()
+            rows = np.union1d(rows, self._and_expr())
+        return rows
+
+    def _and_expr(self):
+        rows = self._not_expr()
+        while self._peek() not in (None, "OR", ")"):
+            if self._peek() == "AND":
+                self._next()
+                continue
+            rows = np.intersect1d(rows, self._not_expr(), assume_unique = True)
+        return rows
+
+    def _not_expr(self):
+        token = self._next()
+        if token is None:
+            return np.arange(self.index.n_rows, dtype = np.int32)
+        if token == "NOT" or (token.startswith("-") and len(token) > 1):
+            if token != "NOT":
+                self.tokens.insert(self.pos, token[1:])
+            self.negated += 1
+            rows = self._complement(self._not_expr())
+            self.negated -= 1
+            return rows
+        if token == "(":
+            rows = self._or_expr()
+            if self._peek() == ")":
+                self._next()
+            return rows
+        return self._near(token)
+
+    def _complement(self, rows):
+        return np.setdiff1d(np.arange(self.index.n_rows, dtype = np.int32), rows, assume_unique = True)
+
+    def _phrase(self, token):
+        # Quoted phrases and keywords like "e-mail" hold several terms, which must appear one after the other
+        if token is None:
+            return []
+        prefix = token.rstrip('"').endswith("*")
+        terms  = tokenize(token)
+        if prefix and terms:
+            terms[-1] = terms[-1] + "*"
+        if not self.negated:
+            self.terms.extend(terms)
+        return terms
+
+    def _near(self, token):
+        terms = self._phrase(token)
+        rows  = (
+            self.index.phrase_rows(terms, self.fields) if terms
+            else np.arange(self.index.n_rows, dtype = np.int32)
+        )
+
+        # Chains like "a NEAR/3 b NEAR/3 c" require every pair of neighbours to be close enough
+        while self._peek() is not None and NEAR_RE.fullmatch(self._peek()):
+            distance = int(NEAR_RE.fullmatch(self._next()).group(1))
+            right    = self._phrase(self._next())
+            if terms and right:
+                rows = np.intersect1d(
+                    rows,
+                    self.index.near_rows(terms, right, distance, self.fields),
+                    assume_unique = True
+                )
+            terms = right
+        return rows
+
+
+def _read_index(country):
+    fields = {}
+    for field in FIELDS:
+        path = index_path(country, field)
+        loader.check_store(country, f"{path}/terms.npy")
+
+        terms = np.load(f"{path}/terms.npy").tobytes().decode("utf-8")
+        terms = terms.split("\n") if terms else []
+        fields[field] = {
+            "terms"    : terms,
+            "lookup"   : {term: position for position, term in enumerate(terms)},
+            "offsets"  : np.load(f"{path}/offsets.npy", mmap_mode = "r"),
+            "postings" : np.load(f"{path}/postings.npy", mmap_mode = "r"),
+
+            "position_offsets" : np.load(f"{path}/position_offsets.npy", mmap_mode = "r"),
+            "positions"        : np.load(f"{path}/positions.npy", mmap_mode = "r"),
+            "lengths"          : np.load(f"{path}/lengths.npy", mmap_mode = "r"),
+            "spans"            : np.load(f"{path}/spans.npy", mmap_mode = "r")
+        }
+        fields[field]["avg_length"] = max(float(np.mean(fields[field]["lengths"])), 1.0)
+
+        # Position of the first token of every document in the spans
+        fields[field]["span_offsets"] = np.concatenate([[0], np.cumsum(fields[field]["lengths"], dtype = np.int64)])
+
+    row_articles = loader.load_pillars(country, ["article"])["article"].to_numpy()
+    return SearchIndex(fields, row_articles)
+
+
+def load_index(country):
+    return loader.load_artifact(("search_index", country), lambda: _read_index(country))
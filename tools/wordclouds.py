@@ -0,0 +1,93 @@
+"""
+Project:        EU ROL Tracker Dashboard
+Module Name:    Wordcloud Cache
+Author:         Carlos Alberto Toruño Paniagua
+Creation Date:  October 17th, 2026
+Description:    This module contains the disk cache of the wordclouds drawn by the Frequency Analysis tab.
+                Wordclouds are rendered once as PNG images (see tools/data_viz.py) and stored on disk, keyed
+                by country, text column, pillar, sentiment, weighting scheme, publishing period, set of
+                stopwords and version of the data store. Any session asking again for the same wordcloud
+                gets the stored image, without computing any score.
+"""
+
+import glob
+import hashlib
+import json
+import os
+
+from tools import catalog
+from tools import data_viz as viz
+
+# Folder of the cached images and disk budget (in megabytes). They can be adjusted per deployment through
+# the ROLTRACKER_WORDCLOUD_CACHE and ROLTRACKER_WORDCLOUD_CACHE_MB environment variables
+WORDCLOUD_CACHE_PATH = os.environ.get("ROLTRACKER_WORDCLOUD_CACHE", "data/cache/wordclouds")
+WORDCLOUD_CACHE_MB   = int(os.environ.get("ROLTRACKER_WORDCLOUD_CACHE_MB", 256))
+
+
+def stopwords_hash(stopwords):
+    # The vectorizers treat the stopwords as a set, so their order and repetitions do not matter
+    return hashlib.sha1("\n".join(sorted(set(stopwords))).encode("utf-8")).hexdigest()
+
+
+def wordcloud_path(country, column, pillar, sentiment, tfidf, stopwords, period = None):
+    key = json.dumps([
+        catalog.manifest(country)["built_at"],
+        column,
+        pillar,
+        sentiment,
+        "tfidf" if tfidf else "counts",
+        stopwords_hash(stopwords),
+        None if period is None else [str(day) for day in period]
+    ])
+    return f"{WORDCLOUD_CACHE_PATH}/{country}/{hashlib.sha1(key.encode('utf-8')).hexdigest()}.png"
+
+
+def _evict():
+    # Removing the least recently used images until the cache is back under budget. Other processes might
+    # be removing them at the same time
+    images = []
+    for path in glob.glob(f"{WORDCLOUD_CACHE_PATH}/*/*.png"):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        images.append((stat.st_mtime, stat.st_size, path))
+    images.sort()
+
+    used = sum(size for _, size, _ in images)
+    for _, size, path in images:
+        if used <= WORDCLOUD_CACHE_MB * 1024**2:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        used -= size
+
+
+def get_wordcloud(country, column, pillar, sentiment, tfidf, stopwords, period, scores):
+    """
+    Returns the PNG image of a wordcloud. Scores is a function returning the frequencies of the terms, only
+    called when the image is not cached yet.
+    """
+
+    path = wordcloud_path(country, column, pillar, sentiment, tfidf, stopwords, period)
+    try:
+        with open(path, "rb") as file:
+            image = file.read()
+        os.utime(path)
+        return image
+    except FileNotFoundError:
+        pass
+
+    image = viz.wordcloud(scores(), freqs = True)
+
+    # Written under a temporary name first, so other processes never read a partial image
+    os.makedirs(os.path.dirname(path), exist_ok = True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(image)
+    os.replace(temporary, path)
+    _evict()
+
+    return image